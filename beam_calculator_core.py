@@ -0,0 +1,1116 @@
+"""Расчетное ядро усиления плиты углепластиком (без Tk и matplotlib)
+
+Модуль импортирует только NumPy, поэтому его можно использовать в пакетных
+расчетах, сервисах и бенчмарках без дисплея. Графический интерфейс
+(beam_calculator_gui_1.py) является тонкой оболочкой над этими функциями.
+"""
+import ast
+import math
+import operator
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+
+import numpy as np
+
+# Толщина одного слоя углепластика, мм
+LAYER_THICKNESS_MM = 0.4
+
+
+@dataclass(frozen=True)
+class SlabParams:
+    """Неизменяемое описание многопустотной плиты (единицы СИ)"""
+    width: float = 1.2
+    height: float = 0.265
+    n_voids: int = 5
+    void_radius: float = 0.075
+    void_rect_height: float = 0.055
+    E_concrete: float = 3e10
+    E_carbon: float = 1.65e11
+    q_load: float = 10602
+    span_length: float = 9.4
+
+    @classmethod
+    def from_dict(cls, params):
+        """Создание из словаря вида BeamCalculatorApp.slab_params"""
+        return cls(**params)
+
+    def as_dict(self):
+        return asdict(self)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    @property
+    def modular_ratio(self):
+        """Коэффициент приведения углепластика к бетону"""
+        return self.E_carbon / self.E_concrete
+
+
+@dataclass(frozen=True)
+class Reinforcement:
+    """Неизменяемое описание усиления: ширина и толщина ленты в мм,
+    длина зоны усиления в % пролета (по центру), количество лент"""
+    width_mm: float = 0
+    thickness_mm: float = 0
+    length_percent: float = 0
+    tape_count: int = 1
+
+    @property
+    def thickness(self):
+        """Толщина ленты, м"""
+        return self.thickness_mm / 1000
+
+    @property
+    def carbon_area(self):
+        """Суммарная площадь всех лент, м²"""
+        if self.thickness_mm <= 0:
+            return 0
+        return self.width_mm / 1000 * self.thickness * self.tape_count
+
+
+@dataclass(frozen=True)
+class Loads:
+    """Неизменяемое описание нагрузок на пролет (Н, Н/м, м; вниз положительные)
+
+    uniform - равномерная нагрузка по всему пролету;
+    point - сосредоточенные силы ((x, P), ...);
+    patch - равномерные нагрузки на участках ((x0, x1, q), ...);
+    table - табличная нагрузка q(x) ((x, q), ...) с линейной интерполяцией
+    между точками и нулем вне таблицы.
+    """
+    uniform: float = 0
+    point: tuple = ()
+    patch: tuple = ()
+    table: tuple = ()
+
+    @classmethod
+    def from_slab(cls, slab):
+        """Только равномерная нагрузка q_load плиты"""
+        return cls(uniform=as_slab(slab).q_load)
+
+    @property
+    def is_uniform(self):
+        return not (self.point or self.patch or self.table)
+
+    def breakpoints(self):
+        """Координаты, где нагрузка или ее производная меняются скачком"""
+        points = [x for x, _ in self.point]
+        points += [x for x0, x1, _ in self.patch for x in (x0, x1)]
+        points += [x for x, _ in self.table]
+        return np.array(points, dtype=float)
+
+    def intensity(self, x, inside=None):
+        """Распределенная нагрузка q(x), Н/м
+
+        inside - точки, по которым определяется попадание на участки patch
+        (по умолчанию сами x); для интервалов сетки это их середины, чтобы
+        значения на границах участков брались изнутри интервала.
+        """
+        x = np.asarray(x, dtype=float)
+        inside = x if inside is None else inside
+        q = np.full(x.shape, float(self.uniform))
+        for x0, x1, q_patch in self.patch:
+            q += np.where((inside >= x0) & (inside <= x1), q_patch, 0.0)
+        if self.table:
+            xt, qt = np.array(sorted(self.table), dtype=float).T
+            q += np.interp(x, xt, qt, left=0.0, right=0.0)
+        return q
+
+
+def parse_load_table(lines):
+    """Точки табличной нагрузки ((x, q), ...) из строк CSV
+
+    Если в строке есть ";" или табуляция, они разделяют столбцы, а запятая -
+    десятичный знак (выгрузка табличного редактора с русской локалью);
+    иначе столбцы разделяются запятой. Строки, не начинающиеся с числа
+    (заголовок, пустые), пропускаются; строка данных без второго числа или
+    с бесконечным/NaN значением - ошибка ValueError.
+    """
+    rows = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if ";" in line or "\t" in line:
+            fields = [field.replace(",", ".") for field in line.replace("\t", ";").split(";")]
+        else:
+            fields = line.split(",")
+        try:
+            x = float(fields[0])
+        except ValueError:
+            continue  # заголовок или пустая строка
+        try:
+            q = float(fields[1])
+        except (ValueError, IndexError):
+            raise ValueError(f"строка {number}: нет числового значения q")
+        if not (math.isfinite(x) and math.isfinite(q)):
+            raise ValueError(f"строка {number}: недопустимое значение {line!r}")
+        rows.append((x, q))
+    if len(rows) < 2:
+        raise ValueError("в таблице меньше двух строк с числами")
+    return tuple(rows)
+
+
+def as_slab(params):
+    """Приведение словаря параметров к SlabParams"""
+    if isinstance(params, SlabParams):
+        return params
+    return SlabParams.from_dict(params)
+
+
+def calculate_inertia(slab, carbon_area=0, carbon_thickness=0):
+    """Момент инерции сечения с пустотами и усилением (поддерживает массивы)
+
+    carbon_area - суммарная площадь всех лент, м²; carbon_thickness - м.
+    """
+    slab = as_slab(slab)
+    r = slab.void_radius
+    h_rect = slab.void_rect_height
+
+    # Сплошной прямоугольник минус пустоты (два полукруга и прямоугольник)
+    I_solid = slab.width * slab.height**3 / 12
+    I_one_void = 2 * (math.pi * r**4) / 8 + (2 * r * h_rect**3) / 12
+    I_concrete = I_solid - slab.n_voids * I_one_void
+
+    carbon_area = np.asarray(carbon_area, dtype=float)
+    carbon_thickness = np.asarray(carbon_thickness, dtype=float)
+    d = (slab.height + carbon_thickness) / 2
+
+    reinforced = (carbon_area > 0) & (carbon_thickness > 0)
+    return np.where(reinforced,
+                    I_concrete + slab.modular_ratio * carbon_area * d**2,
+                    I_concrete)
+
+
+def calculate_moment(x, L, q):
+    """Изгибающий момент в сечении x (x может быть массивом)"""
+    return (q * L * x / 2) - (q * x**2 / 2)
+
+
+def calculate_shear_force(x, L, q):
+    """Поперечная сила в сечении x (x может быть массивом)"""
+    return (q * L / 2) - (q * x)
+
+
+def load_stations(L, loads, n_points=1000, extra_points=()):
+    """Сетка точек пролета с узлами во всех точках излома нагрузки
+
+    Под сосредоточенными силами точка повторяется дважды (слева и справа),
+    чтобы скачок поперечной силы попадал на интервал нулевой длины.
+    """
+    breaks = np.clip(np.concatenate((loads.breakpoints(), np.asarray(extra_points, dtype=float))), 0, L)
+    x = np.union1d(np.linspace(0, L, n_points), breaks)
+    forces = np.clip([x_p for x_p, _ in loads.point], 0, L)
+    return np.sort(np.concatenate((x, forces)))
+
+
+def calculate_internal_forces(slab, loads, n_points=1000, extra_points=()):
+    """Поперечная сила и изгибающий момент шарнирно опертой балки
+    от произвольных нагрузок (x, Q, M) за O(n)
+
+    Накопленные интегралы нагрузки V(x) = ∫q + ΣP и ее момента
+    S(x) = ∫V берутся по интервалам сетки: для кусочно-линейной q(x)
+    формула трапеций для V и поправка h²·(2q₀ + q₁)/6 для S точны.
+    """
+    slab = as_slab(slab)
+    L = slab.span_length
+    x = load_stations(L, loads, n_points, extra_points)
+    h = np.diff(x)
+
+    # Нагрузка на концах каждого интервала (участки - по середине интервала)
+    middle = (x[:-1] + x[1:]) / 2
+    q_start = loads.intensity(x[:-1], middle)
+    q_end = loads.intensity(x[1:], middle)
+
+    # Сосредоточенные силы приходятся на интервалы нулевой длины
+    concentrated = np.zeros_like(h)
+    for x_p, P in loads.point:
+        i = np.flatnonzero((h == 0) & (x[:-1] == np.clip(x_p, 0, L)))[0]
+        concentrated[i] += P
+
+    V = np.concatenate(([0.0], np.cumsum(h * (q_start + q_end) / 2 + concentrated)))
+    S = np.concatenate(([0.0], np.cumsum(h * V[:-1] + h**2 * (2 * q_start + q_end) / 6)))
+
+    # Реакция левой опоры из условия M(L) = 0
+    R_left = S[-1] / L
+    return x, R_left - V, R_left * x - S
+
+
+def deflection_from_moment(slab, segments, x, M):
+    """Прогиб (мм) во всех точках x по эпюре моментов M за O(n)
+
+    δ(x) = [(L - x)·∫₀ˣ M·ξ/EI dξ + x·∫ₓᴸ M·(L - ξ)/EI dξ] / L; оба интеграла
+    накапливаются формулой трапеций сразу для всей сетки, EI берется
+    по участкам в середине интервала.
+    """
+    slab = as_slab(slab)
+    L = slab.span_length
+    lo, hi, EI = segment_arrays(L, segments)
+    x = np.asarray(x, dtype=float)
+    M = np.asarray(M, dtype=float)
+
+    h = np.diff(x)
+    middle = (x[:-1] + x[1:]) / 2
+    EI_interval = EI[np.clip(np.searchsorted(hi, middle), 0, len(EI) - 1)]
+
+    def cumulative(f):
+        return np.concatenate(([0.0], np.cumsum(h * (f[:-1] + f[1:]) / 2 / EI_interval)))
+
+    A = cumulative(M * x)
+    B = cumulative(M * (L - x))
+    return ((L - x) * A + x * (B[-1] - B)) / L * 1000
+
+
+def calculate_load_response(slab, reinforcement, loads, n_points=1000):
+    """Эпюры Q, M и прогиб (мм) для произвольных нагрузок: (x, Q, M, прогиб)"""
+    slab = as_slab(slab)
+    segments = reinforcement_segments(slab, reinforcement)
+    edges = [x for segment in segments for x in segment[:2]]
+    x, Q, M = calculate_internal_forces(slab, loads, n_points, edges)
+    return x, Q, M, deflection_from_moment(slab, segments, x, M)
+
+
+def calculate_stress(slab, reinforcement, M, y):
+    """Нормальные напряжения σ (Па) от момента M на высоте y сечения
+
+    y отсчитывается от низа бетона (лента при y < 0), в углепластике
+    напряжения умножаются на коэффициент приведения. M и y транслируются
+    (broadcast) друг с другом, например M[:, None] и y[None, :] дают
+    поле напряжений σ(x, y).
+    """
+    slab = as_slab(slab)
+    I = calculate_inertia(slab, reinforcement.carbon_area, reinforcement.thickness)
+    y = np.asarray(y, dtype=float)
+    y_neutral = (slab.height - reinforcement.thickness) / 2
+    sigma = np.asarray(M, dtype=float) * (y - y_neutral) / I
+    return np.where(y < 0, slab.modular_ratio * sigma, sigma)
+
+
+def calculate_stress_field(slab, reinforcement, n_x=400, n_y=200, moment=None):
+    """Поле нормальных напряжений σ(x, y) (Па) по всему пролету
+
+    σ = M(x)·(y - y0(x))/I(x): момент инерции и положение нейтральной оси
+    переключаются на концах ленты, в углепластике напряжения умножаются на
+    коэффициент приведения, вне зоны усиления слой ленты заполнен NaN.
+    moment - эпюра (x_m, M) для другой нагрузки или схемы опирания, она
+    интерполируется на сетку поля по всей длине x_m (зона усиления - по центру
+    каждого пролета); по умолчанию - равномерная нагрузка на шарнирно опертой
+    балке. Возвращает x (n_x), y (n_y) и σ формы (n_y, n_x).
+    """
+    slab = as_slab(slab)
+    L, q = slab.span_length, slab.q_load
+    thickness = reinforcement.thickness
+
+    if moment is None:
+        x = np.linspace(0, L, n_x)
+        M = calculate_moment(x, L, q)
+    else:
+        x_m, M_m = moment
+        x = np.linspace(x_m[0], x_m[-1], n_x)
+        M = np.interp(x, x_m, M_m)
+    y = np.linspace(-thickness, slab.height, n_y)
+
+    # Параметры сечения в каждой точке: координата внутри своего пролета
+    x_span = x - L * np.maximum(np.ceil(x / L) - 1, 0)
+    a, b = _reinforced_zone(L, reinforcement.length_percent)
+    in_zone = (x_span >= a) & (x_span <= b) & (reinforcement.carbon_area > 0)
+    I = np.where(in_zone,
+                 calculate_inertia(slab, reinforcement.carbon_area, thickness),
+                 calculate_inertia(slab))
+    y_neutral = np.where(in_zone, (slab.height - thickness) / 2, slab.height / 2)
+
+    # Внешнее произведение: строки - высота сечения, столбцы - пролет
+    sigma = M / I * (y[:, None] - y_neutral)
+    carbon = y[:, None] < 0
+    sigma = np.where(carbon, slab.modular_ratio * sigma, sigma)
+    sigma[carbon & ~in_zone] = np.nan
+
+    return x, y, sigma
+
+
+def _reinforced_zone(L, length_percent):
+    """Границы зоны усиления [a, b]; при 100% и более усилен весь пролет"""
+    a = (L - np.clip(length_percent, 0, 100) / 100 * L) / 2
+    return a, L - a
+
+
+def _mohr_midspan_antiderivative(x, L, q):
+    """Первообразная M·M̄ от 0 до x для единичной силы в середине пролета
+
+    M = q·x·(L - x)/2, M̄ = x/2 слева от середины и (L - x)/2 справа,
+    поэтому на каждой половине пролета интеграл - многочлен 4-й степени.
+    """
+    x = np.asarray(x, dtype=float)
+
+    def left(xi):
+        return q / 4 * (L * xi**3 / 3 - xi**4 / 4)
+
+    def right(xi):
+        return q / 4 * (L**2 * xi**2 / 2 - 2 * L * xi**3 / 3 + xi**4 / 4)
+
+    return np.where(x <= L / 2, left(x),
+                    left(L / 2) + right(x) - right(L / 2))
+
+
+def reinforcement_segments(slab, reinforcement):
+    """Участки постоянной жесткости [(x0, x1, EI), ...] для одной зоны
+    усиления по центру пролета; участки нулевой длины отбрасываются"""
+    slab = as_slab(slab)
+    I = float(calculate_inertia(slab, reinforcement.carbon_area, reinforcement.thickness))
+    return _zone_segments(slab, reinforcement.length_percent, I, float(calculate_inertia(slab)))
+
+
+def _zone_segments(slab, length_percent, I, I_unreinforced):
+    L, E = slab.span_length, slab.E_concrete
+    a, b = _reinforced_zone(L, length_percent)
+    segments = [(0.0, a, E * I_unreinforced), (a, b, E * I), (b, L, E * I_unreinforced)]
+    return [(x0, x1, EI) for x0, x1, EI in segments if x1 > x0]
+
+
+def staggered_segments(slab, width_mm, layer_lengths_percent, tape_count=1):
+    """Участки жесткости для ступенчатого усиления
+
+    layer_lengths_percent - длины слоев (% пролета, по центру) снизу вверх;
+    каждый слой толщиной LAYER_THICKNESS_MM. На каждом участке учитываются
+    только слои, перекрывающие его.
+    """
+    slab = as_slab(slab)
+    L, E = slab.span_length, slab.E_concrete
+    lengths = np.asarray(layer_lengths_percent, dtype=float)
+
+    a, b = _reinforced_zone(L, lengths)
+    edges = np.unique(np.concatenate(([0.0, L], np.atleast_1d(a), np.atleast_1d(b))))
+    middles = (edges[:-1] + edges[1:]) / 2
+
+    # Число слоев над серединой каждого участка
+    n_layers = ((middles[:, None] >= a) & (middles[:, None] <= b)).sum(axis=1)
+    thickness = n_layers * LAYER_THICKNESS_MM / 1000
+    I = calculate_inertia(slab, width_mm / 1000 * thickness * tape_count, thickness)
+
+    return [(float(x0), float(x1), float(E * Ii))
+            for x0, x1, Ii in zip(edges[:-1], edges[1:], I) if x1 > x0]
+
+
+def apply_stiffness_zones(segments, zones):
+    """Изменение жесткости на отдельных зонах (проемы, поврежденные участки)
+
+    zones - [(x0, x1, коэффициент), ...]; EI на пересечении с зоной умножается
+    на коэффициент, участки при необходимости делятся на границах зон.
+    """
+    for z0, z1, factor in zones:
+        result = []
+        for x0, x1, EI in segments:
+            cuts = sorted({x0, x1, *(c for c in (z0, z1) if x0 < c < x1)})
+            for c0, c1 in zip(cuts[:-1], cuts[1:]):
+                inside = z0 <= c0 and c1 <= z1
+                result.append((c0, c1, EI * factor if inside else EI))
+        segments = result
+    return segments
+
+
+def segment_arrays(L, segments, tol=1e-9):
+    """Границы и жесткости участков с проверкой, что они покрывают [0, L]"""
+    segments = sorted(segments)
+    if not segments:
+        raise ValueError("Не заданы участки балки")
+    lo, hi, EI = (np.array(v, dtype=float) for v in zip(*segments))
+    if abs(lo[0]) > tol or abs(hi[-1] - L) > tol or np.any(np.abs(lo[1:] - hi[:-1]) > tol):
+        raise ValueError("Участки должны без разрывов и наложений покрывать пролет [0, L]")
+    if np.any(hi <= lo) or np.any(EI <= 0):
+        raise ValueError("Участки должны иметь положительные длину и жесткость")
+    return lo, hi, EI
+
+
+def piecewise_deflection(slab, segments, x_points):
+    """Прогиб (мм) в точках x_points для балки из участков [(x0, x1, EI), ...]
+
+    Для единичной силы в точке x: M̄(ξ) = ξ·(L - x)/L при ξ <= x и
+    x·(L - ξ)/L при ξ > x. Интегралы M·M̄ по участкам постоянной EI
+    берутся по точным первообразным G1 = ∫M·ξ dξ и G2 = ∫M·(L - ξ) dξ
+    для матрицы "точки × участки" без цикла по точкам; стоимость линейна
+    по числу участков.
+    """
+    slab = as_slab(slab)
+    L, q = slab.span_length, slab.q_load
+    lo, hi, EI = segment_arrays(L, segments)
+
+    def G1(xi):
+        return q / 2 * (L * xi**3 / 3 - xi**4 / 4)
+
+    def G2(xi):
+        return q / 2 * (L**2 * xi**2 / 2 - 2 * L * xi**3 / 3 + xi**4 / 4)
+
+    x_points = np.asarray(x_points, dtype=float)
+    x = x_points.reshape(-1, 1)
+    x_clip = np.clip(x, lo, hi)
+
+    left = (G1(x_clip) - G1(lo)) * (L - x) / L
+    right = (G2(hi) - G2(x_clip)) * x / L
+    deflections = (left + right) @ (1 / EI)
+
+    return deflections.reshape(x_points.shape) * 1000
+
+
+def calculate_deflection(slab, reinforcement, method="analytic"):
+    """Прогиб в середине пролета (мм) по интегралу Мора
+
+    method: "analytic" - точные первообразные по участкам,
+    "reference" - численное интегрирование scipy.integrate.quad (для сверки).
+    """
+    if method == "reference":
+        return calculate_deflection_reference(slab, reinforcement)
+    if method != "analytic":
+        raise ValueError(f"Неизвестный метод расчета прогиба: {method}")
+
+    slab = as_slab(slab)
+    segments = reinforcement_segments(slab, reinforcement)
+    return float(piecewise_deflection(slab, segments, slab.span_length / 2))
+
+
+def midspan_deflection(slab, length_percent, I, I_unreinforced):
+    """Прогиб в середине пролета (мм) при известных моментах инерции
+    усиленного и неусиленного сечений"""
+    slab = as_slab(slab)
+    segments = _zone_segments(slab, length_percent, float(I), float(I_unreinforced))
+    return float(piecewise_deflection(slab, segments, slab.span_length / 2))
+
+
+def calculate_deflection_reference(slab, reinforcement):
+    """Эталонный расчет прогиба численным интегрированием (scipy quad)"""
+    from scipy.integrate import quad
+
+    slab = as_slab(slab)
+    L, q, E = slab.span_length, slab.q_load, slab.E_concrete
+
+    I = float(calculate_inertia(slab, reinforcement.carbon_area, reinforcement.thickness))
+    I_unreinforced = float(calculate_inertia(slab))
+
+    def integrand(x, I):
+        M = calculate_moment(x, L, q)
+        M_bar = x / 2 if x <= L / 2 else (L - x) / 2
+        return M * M_bar / (E * I)
+
+    if reinforcement.length_percent >= 100:
+        result, _ = quad(integrand, 0, L, args=(I,))
+        return result * 1000
+
+    a, b = _reinforced_zone(L, reinforcement.length_percent)
+    part1, _ = quad(integrand, 0, a, args=(I_unreinforced,))
+    part2, _ = quad(integrand, a, b, args=(I,))
+    part3, _ = quad(integrand, b, L, args=(I_unreinforced,))
+
+    return (part1 + part2 + part3) * 1000
+
+
+def calculate_deflection_curve(slab, reinforcement, n_points=500):
+    """Кривая прогиба (x, мм) сразу во всех точках"""
+    slab = as_slab(slab)
+    x_points = np.linspace(0, slab.span_length, n_points)
+    segments = reinforcement_segments(slab, reinforcement)
+    return x_points, piecewise_deflection(slab, segments, x_points)
+
+
+def calculate_design_grid(slab, widths_mm, thicknesses_mm, lengths_percent,
+                          tape_counts=1, grid=True):
+    """Пакетный расчет прогибов и эффективности усиления
+
+    grid=True - декартово произведение входных наборов, результат имеет форму
+    (ширины, толщины, длины, ленты); grid=False - входы транслируются
+    (broadcast) друг с другом как есть.
+
+    Возвращает словарь массивов: deflection (мм), reduction (%), layers,
+    area (м²), efficiency (%/м²) и base_deflection (мм).
+    """
+    slab = as_slab(slab)
+    arrays = [np.atleast_1d(np.asarray(v, dtype=float)) if grid else np.asarray(v, dtype=float)
+              for v in (widths_mm, thicknesses_mm, lengths_percent, tape_counts)]
+    if grid:
+        arrays = np.meshgrid(*arrays, indexing='ij', sparse=True)
+    width_mm, thickness_mm, length_percent, tape_count = arrays
+
+    L, q, E = slab.span_length, slab.q_load, slab.E_concrete
+
+    width = width_mm / 1000
+    thickness = thickness_mm / 1000
+    carbon_area = width * thickness * tape_count
+
+    I = calculate_inertia(slab, carbon_area, thickness)
+    I_unreinforced = calculate_inertia(slab)
+
+    a, _ = _reinforced_zone(L, length_percent)
+    F_total = _mohr_midspan_antiderivative(L, L, q)
+    F_outer = 2 * _mohr_midspan_antiderivative(a, L, q)
+
+    deflection = (F_outer / I_unreinforced + (F_total - F_outer) / I) / E * 1000
+    base_deflection = float(F_total / (E * I_unreinforced) * 1000)
+
+    reduction = (base_deflection - deflection) / base_deflection * 100
+    layers = np.ceil(np.round(thickness_mm / LAYER_THICKNESS_MM, 9))
+    L_lenta = length_percent / 100 * L
+    area = width * L_lenta * tape_count * layers
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efficiency = np.where(area > 0, reduction / area, 0.0)
+
+    shape = np.broadcast_shapes(deflection.shape, area.shape)
+    return {
+        'deflection': np.broadcast_to(deflection, shape),
+        'reduction': np.broadcast_to(reduction, shape),
+        'layers': np.broadcast_to(layers, shape).astype(int),
+        'area': np.broadcast_to(area, shape),
+        'efficiency': np.broadcast_to(efficiency, shape),
+        'base_deflection': base_deflection,
+    }
+
+
+def deflection_sensitivities(slab, width_mm, thickness_mm, length_percent, tape_count=1):
+    """Прогиб в середине пролета и его точные производные (входы транслируются)
+
+    f = [F_outer/I₀ + (F_total - F_outer)/I] / E, где F_outer = 2·F(a) -
+    интеграл Мора по неусиленным концам, I = I₀ + n·A·d², A = w·t·k,
+    d = (h + t)/2. Производные берутся дифференцированием этих выражений,
+    без конечных разностей.
+
+    Возвращает словарь: deflection (мм) и производные прогиба (мм на единицу
+    параметра) по width_mm (мм), thickness_mm (мм), length_percent (%),
+    E_carbon (Па) и q_load (Н/м).
+    """
+    slab = as_slab(slab)
+    L, q, E, h = slab.span_length, slab.q_load, slab.E_concrete, slab.height
+    n = slab.modular_ratio
+
+    width = np.asarray(width_mm, dtype=float) / 1000
+    thickness = np.asarray(thickness_mm, dtype=float) / 1000
+    length_percent = np.asarray(length_percent, dtype=float)
+    tape_count = np.asarray(tape_count, dtype=float)
+
+    area = width * thickness * tape_count
+    d = (h + thickness) / 2
+    I0 = calculate_inertia(slab)
+    I = I0 + n * area * d**2
+
+    a, _ = _reinforced_zone(L, length_percent)
+    F_total = _mohr_midspan_antiderivative(L, L, q)
+    F_outer = 2 * _mohr_midspan_antiderivative(a, L, q)
+    deflection = (F_outer / I0 + (F_total - F_outer) / I) / E * 1000
+
+    # ∂f/∂I и производные I по параметрам ленты (на 1 мм)
+    df_dI = -(F_total - F_outer) / I**2 / E * 1000
+    dI_dwidth = n * thickness * tape_count * d**2 / 1000
+    dI_dthickness = (n * width * tape_count * d**2 + n * area * d) / 1000
+    dI_dE_carbon = area * d**2 / E
+
+    # dF_outer/da = 2·M(a)·M̄(a) = q·a²·(L - a)/2, da/d(%) = -L/200;
+    # при 0% - правая производная, при 100% зона упирается в опоры
+    inside = (length_percent >= 0) & (length_percent < 100)
+    dF_outer = np.where(inside, q * a**2 * (L - a) / 2 * (-L / 200), 0.0)
+    df_dlength = dF_outer * (1 / I0 - 1 / I) / E * 1000
+
+    return {
+        'deflection': deflection,
+        'width_mm': df_dI * dI_dwidth,
+        'thickness_mm': df_dI * dI_dthickness,
+        'length_percent': df_dlength,
+        'E_carbon': df_dI * dI_dE_carbon,
+        'q_load': deflection / q,
+    }
+
+
+def sampled_deflection(slab, reinforcement):
+    """Прогиб в середине пролета (мм), когда поля SlabParams - массивы выборок"""
+    I = calculate_inertia(slab, reinforcement.carbon_area, reinforcement.thickness)
+    I_unreinforced = calculate_inertia(slab)
+    L, q, E = slab.span_length, slab.q_load, slab.E_concrete
+
+    a, _ = _reinforced_zone(L, reinforcement.length_percent)
+    F_total = _mohr_midspan_antiderivative(L, L, q)
+    F_outer = 2 * _mohr_midspan_antiderivative(a, L, q)
+    return (F_outer / I_unreinforced + (F_total - F_outer) / I) / E * 1000
+
+
+def _draw_samples(rng, kind, a, b, size):
+    """Выборка параметра: normal(среднее, ст. отклонение),
+    lognormal(среднее, ст. отклонение величины), uniform(min, max)"""
+    if kind == "normal":
+        return rng.normal(a, b, size)
+    if kind == "lognormal":
+        sigma2 = np.log1p((b / a) ** 2)
+        return rng.lognormal(np.log(a) - sigma2 / 2, np.sqrt(sigma2), size)
+    if kind == "uniform":
+        return rng.uniform(a, b, size)
+    raise ValueError(f"Неизвестное распределение: {kind}")
+
+
+def _monte_carlo_chunk(slab, reinforcement, distributions, n_samples, seed):
+    """Прогибы для одной порции выборок (функция верхнего уровня для пула процессов)"""
+    rng = np.random.default_rng(seed)
+    samples = {name: _draw_samples(rng, *spec, n_samples)
+               for name, spec in distributions.items()}
+    return sampled_deflection(slab.replace(**samples), reinforcement)
+
+
+def monte_carlo_deflection(slab, reinforcement, distributions, n_samples=100_000,
+                           limit=None, chunk_size=100_000, seed=None, workers=None,
+                           percentiles=(5, 50, 95, 99)):
+    """Вероятностный расчет прогиба методом Монте-Карло
+
+    distributions - {имя поля SlabParams: (вид, a, b)}, вид: "normal",
+    "lognormal" (a - среднее, b - стандартное отклонение) или "uniform"
+    (a, b - границы); остальные параметры плиты детерминированы.
+    Выборки обрабатываются порциями по chunk_size, чтобы ограничить память;
+    workers > 1 распределяет порции по пулу процессов. Каждая порция
+    получает свой поток случайных чисел от seed, поэтому результат
+    не зависит от числа процессов.
+
+    Возвращает словарь: mean, std, percentiles {p: мм}, limit (мм, по
+    умолчанию L/250) и p_exceed - вероятность превышения предела.
+    """
+    slab = as_slab(slab)
+    unknown = set(distributions) - set(slab.as_dict())
+    if unknown:
+        raise ValueError(f"Неизвестные параметры плиты: {', '.join(sorted(unknown))}")
+    if limit is None:
+        limit = deflection_limit(slab)
+
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(slab, reinforcement, distributions, size, chunk_seed)
+            for size, chunk_seed in zip(sizes, seeds)]
+
+    if workers and workers > 1 and len(args) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_monte_carlo_chunk, *zip(*args)))
+    else:
+        chunks = [_monte_carlo_chunk(*chunk_args) for chunk_args in args]
+
+    deflection = np.concatenate(chunks)
+    return {
+        'n_samples': n_samples,
+        'mean': float(deflection.mean()),
+        'std': float(deflection.std()),
+        'percentiles': dict(zip(percentiles, np.percentile(deflection, percentiles).tolist())),
+        'limit': float(limit),
+        'p_exceed': float(np.count_nonzero(deflection > limit) / n_samples),
+    }
+
+
+def deflection_limit(slab, ratio=250):
+    """Предельный прогиб L/ratio, мм"""
+    return as_slab(slab).span_length / ratio * 1000
+
+
+def optimize_design(slab, target_deflection=None, target_reduction=None,
+                    widths_mm=(50, 100, 150, 200, 250, 300), max_layers=25,
+                    lengths_percent=tuple(range(5, 101, 5)), tape_counts=(1, 2, 3),
+                    objective="area", material_cost=1.0, labor_cost=0.0, n_best=5,
+                    thicknesses_mm=None):
+    """Подбор усиления минимальной площади (или стоимости) при заданном прогибе
+
+    Цель задается предельным прогибом target_deflection (мм, например
+    deflection_limit(slab, 250)) или требуемым снижением прогиба
+    target_reduction (%). Прогиб монотонно убывает с числом слоев, поэтому
+    для всех сочетаний ширины, длины и числа лент одновременно ищется
+    минимальное достаточное число слоев бисекцией (log2(max_layers)
+    векторных шагов вместо перебора).
+
+    thicknesses_mm - допустимые толщины ленты, мм (например, строки таблицы
+    интерфейса); по умолчанию 0..max_layers целых слоев.
+    objective: "area" - площадь углепластика с учетом слоев, м²;
+    "cost" - material_cost·площадь + labor_cost·длина наклейки лент (м).
+
+    Возвращает до n_best лучших вариантов (словари), лучший - первый;
+    пустой список, если цель недостижима.
+    """
+    slab = as_slab(slab)
+    if objective not in ("area", "cost"):
+        raise ValueError(f"Неизвестный критерий оптимизации: {objective}")
+    base = calculate_design_grid(slab, 0, 0, 0)['base_deflection']
+    if target_deflection is None:
+        if target_reduction is None:
+            raise ValueError("Задайте предельный прогиб или требуемое снижение прогиба")
+        target_deflection = base * (1 - target_reduction / 100)
+
+    if base <= target_deflection:
+        return [{'width_mm': 0, 'layers': 0, 'thickness_mm': 0.0, 'length_percent': 0,
+                 'tape_count': 0, 'deflection': base, 'reduction': 0.0,
+                 'area': 0.0, 'cost': 0.0}]
+
+    width_mm, length_percent, tape_count = np.meshgrid(
+        np.asarray(widths_mm, dtype=float), np.asarray(lengths_percent, dtype=float),
+        np.asarray(tape_counts, dtype=float), indexing='ij')
+
+    if thicknesses_mm is None:
+        thicknesses_mm = np.arange(max_layers + 1) * LAYER_THICKNESS_MM
+    thicknesses_mm = np.sort(np.asarray(thicknesses_mm, dtype=float))
+
+    def deflection(index):
+        return calculate_design_grid(
+            slab, width_mm, thicknesses_mm[index.astype(int)], length_percent, tape_count,
+            grid=False)['deflection']
+
+    # Бисекция по номеру толщины: lo - недостаточно (-1 - без усиления),
+    # hi - достаточно
+    lo = np.full(width_mm.shape, -1.0)
+    hi = np.full(width_mm.shape, float(len(thicknesses_mm) - 1))
+    feasible = deflection(hi) <= target_deflection
+    while np.any(hi - lo > 1):
+        mid = np.floor((lo + hi) / 2)
+        ok = deflection(mid) <= target_deflection
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+
+    thickness_mm = thicknesses_mm[hi.astype(int)]
+    result = calculate_design_grid(
+        slab, width_mm, thickness_mm, length_percent, tape_count, grid=False)
+    layers = result['layers']
+    tape_length = length_percent / 100 * slab.span_length * tape_count
+    cost = material_cost * result['area'] + labor_cost * tape_length
+    score = np.where(feasible, result['area'] if objective == "area" else cost, np.inf)
+
+    # Лучшие варианты: при равенстве - меньший прогиб
+    order = np.lexsort((result['deflection'].ravel(), score.ravel()))
+    best = [i for i in order[:n_best] if np.isfinite(score.flat[i])]
+    return [{
+        'width_mm': float(width_mm.flat[i]),
+        'layers': int(layers.flat[i]),
+        'thickness_mm': float(thickness_mm.flat[i]),
+        'length_percent': float(length_percent.flat[i]),
+        'tape_count': int(tape_count.flat[i]),
+        'deflection': float(result['deflection'].flat[i]),
+        'reduction': float(result['reduction'].flat[i]),
+        'area': float(result['area'].flat[i]),
+        'cost': float(cost.flat[i]),
+    } for i in best]
+
+
+class DesignResults:
+    """Результаты расчета набора вариантов в виде типизированных столбцов NumPy
+
+    Каждый столбец - одномерный массив одной длины. Срез results[i:j] и
+    выборка по маске results[mask] возвращают новый DesignResults (срез -
+    без копирования данных); столбцы таблицы, графиков и экспорта читаются
+    напрямую.
+    """
+    __slots__ = ('width_mm', 'thickness_mm', 'length_percent', 'tape_count',
+                 'layers', 'deflection', 'reduction', 'area', 'efficiency')
+
+    DTYPES = {
+        'width_mm': np.float64, 'thickness_mm': np.float64, 'length_percent': np.float64,
+        'tape_count': np.int64, 'layers': np.int64, 'deflection': np.float64,
+        'reduction': np.float64, 'area': np.float64, 'efficiency': np.float64,
+    }
+
+    def __init__(self, **columns):
+        arrays = {name: np.asarray(columns.get(name, 0), dtype=dtype)
+                  for name, dtype in self.DTYPES.items()}
+        sizes = {a.size for a in arrays.values() if a.ndim}
+        if len(sizes) > 1:
+            raise ValueError("Столбцы результатов должны иметь одинаковую длину")
+        n = sizes.pop() if sizes else 0
+        for name, array in arrays.items():
+            # Скаляры (например, общая ширина ленты) разворачиваются без копии
+            setattr(self, name, np.broadcast_to(array, (n,)) if array.ndim == 0 else array.ravel())
+
+    @classmethod
+    def from_grid(cls, results, width_mm, thickness_mm, length_percent, tape_count=1):
+        """Из словаря calculate_design_grid (или ResultStore.load) для набора толщин"""
+        return cls(width_mm=width_mm, thickness_mm=thickness_mm,
+                   length_percent=length_percent, tape_count=tape_count,
+                   **{name: results[name] for name in
+                      ('layers', 'deflection', 'reduction', 'area', 'efficiency')})
+
+    def __len__(self):
+        return len(self.deflection)
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return getattr(self, index)
+        # Целый индекс дает набор из одной строки, а не пустой
+        return DesignResults(**{name: np.atleast_1d(getattr(self, name)[index])
+                                for name in self.__slots__})
+
+    def __repr__(self):
+        return f"DesignResults({len(self)} вариантов)"
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def as_dict(self):
+        """Столбцы по именам (без копирования)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def filter(self, expression):
+        """Маска строк по выражению над столбцами, см. filter_mask"""
+        return filter_mask(self, expression)
+
+
+_FILTER_OPERATORS = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.BitAnd: operator.and_, ast.BitOr: operator.or_,
+}
+
+
+def filter_mask(results, expression):
+    """Векторная маска строк DesignResults по выражению вида
+    "reduction > 20 and area < 1.5"
+
+    Допускаются имена столбцов, числа, сравнения (в том числе цепочки
+    0 < area <= 2), арифметика, and/or/not и &/| (условия - в скобках,
+    как в NumPy: (reduction > 20) & (area < 1.5)). Выражение разбирается
+    модулем ast и вычисляется над целыми столбцами, без eval и без цикла
+    по строкам.
+    """
+    n = len(results)
+    if not expression.strip():
+        return np.ones(n, dtype=bool)
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        raise ValueError(f"Некорректное выражение фильтра: {expression}") from None
+
+    def evaluate(node):
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            # Условия над столбцами и скалярные условия приводятся к длине набора
+            return combine.reduce([np.broadcast_to(evaluate(value), (n,))
+                                   for value in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return np.logical_not(evaluate(node.operand))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -evaluate(node.operand)
+        if isinstance(node, ast.Compare):
+            left, masks = evaluate(node.left), []
+            for op, comparator in zip(node.ops, node.comparators):
+                right = evaluate(comparator)
+                masks.append(np.broadcast_to(_FILTER_OPERATORS[type(op)](left, right), (n,)))
+                left = right
+            return np.logical_and.reduce(masks)
+        if isinstance(node, ast.BinOp) and type(node.op) in _FILTER_OPERATORS:
+            return _FILTER_OPERATORS[type(node.op)](evaluate(node.left), evaluate(node.right))
+        if isinstance(node, ast.Name) and node.id in DesignResults.__slots__:
+            return getattr(results, node.id)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            raise ValueError(f"Неизвестный столбец: {node.id}")
+        raise ValueError(f"Недопустимый элемент выражения фильтра: {ast.dump(node)[:40]}")
+
+    try:
+        mask = np.asarray(evaluate(tree.body))
+    except KeyError:
+        raise ValueError(f"Недопустимый оператор в выражении фильтра: {expression}") from None
+    except TypeError:
+        # & и | связывают сильнее сравнений: "a > 1 & b < 2" - это "a > (1 & b) < 2"
+        raise ValueError("Условия с & и | заключаются в скобки: "
+                         "(reduction > 20) & (area < 1.5)") from None
+    if mask.dtype != bool:
+        raise ValueError("Выражение фильтра должно быть условием (сравнением)")
+    return np.broadcast_to(mask, (n,))
+
+
+def design_catalogue(slab, widths_mm=(50, 100, 150, 200, 250, 300), max_layers=25,
+                     lengths_percent=tuple(range(0, 101, 5)), tape_counts=(1, 2, 3)):
+    """Каталог всех вариантов усиления одним векторным расчетом (DesignResults)"""
+    layers = np.arange(max_layers + 1)
+    grid = calculate_design_grid(
+        slab, widths_mm, layers * LAYER_THICKNESS_MM, lengths_percent, tape_counts)
+    axes = np.meshgrid(np.asarray(widths_mm, dtype=float), layers,
+                       np.asarray(lengths_percent, dtype=float),
+                       np.asarray(tape_counts, dtype=float), indexing='ij')
+    columns = dict(zip(('width_mm', 'layers', 'length_percent', 'tape_count'), axes))
+    columns['thickness_mm'] = columns['layers'] * LAYER_THICKNESS_MM
+    for name in ('deflection', 'reduction', 'area', 'efficiency'):
+        columns[name] = grid[name]
+    return DesignResults(**columns)
+
+
+def pareto_front(*objectives):
+    """Индексы недоминируемых точек (все критерии минимизируются)
+
+    Двумерный и трехмерный случаи решаются "линией горизонта" за O(n log n):
+    точки упорядочиваются лексикографически по критериям, после чего
+    точка доминируется, только если среди предыдущих есть точка не хуже
+    по второму и третьему критериям. Для трех критериев минимум третьего
+    по префиксу рангов второго хранится в дереве Фенвика. Совпадающие
+    точки входят во фронт один раз. Результат упорядочен по первому критерию.
+    """
+    if not 2 <= len(objectives) <= 3:
+        raise ValueError("Поддерживаются два или три критерия")
+    values = np.column_stack([np.asarray(o, dtype=float).ravel() for o in objectives])
+    order = np.lexsort(values.T[::-1])
+    values = values[order]
+
+    # Совпадающие точки: остается первая
+    distinct = np.concatenate(([True], np.any(np.diff(values, axis=0) != 0, axis=1)))
+
+    if values.shape[1] == 2:
+        # Точка на фронте, если ее второй критерий меньше всех предыдущих
+        best_before = np.minimum.accumulate(np.concatenate(([np.inf], values[:-1, 1])))
+        return order[distinct & (values[:, 1] < best_before)]
+
+    ranks = np.unique(values[:, 1], return_inverse=True)[1].ravel() + 1
+    tree = np.full(ranks.max() + 1, np.inf)
+    front = []
+    for i in range(len(values)):
+        if not distinct[i]:
+            continue
+        # Минимум третьего критерия среди точек со вторым критерием не больше
+        r, best = ranks[i], np.inf
+        while r > 0:
+            best = min(best, tree[r])
+            r -= r & -r
+        if best <= values[i, 2]:
+            continue
+        front.append(order[i])
+        r = ranks[i]
+        while r < len(tree):
+            tree[r] = min(tree[r], values[i, 2])
+            r += r & -r
+    return np.array(front, dtype=int)
+
+
+def _bracket(axis, value):
+    """Индексы соседних узлов сетки и доля для линейной интерполяции"""
+    n = len(axis)
+    value = min(max(value, axis[0]), axis[-1])
+    i = int(np.clip(np.searchsorted(axis, value, side='right') - 1, 0, max(n - 2, 0)))
+    i1 = min(i + 1, n - 1)
+    t = 0.0 if i1 == i else (value - axis[i]) / (axis[i1] - axis[i])
+    return i, i1, t
+
+
+class DesignSurface:
+    """Предрасчитанная поверхность результатов на сетке параметров
+
+    Хранит поля calculate_design_grid в компактных массивах формы
+    (ширины, толщины, длины, ленты). lookup() для значений на сетке
+    выполняется за O(1) по индексам, вне сетки - билинейной интерполяцией
+    по ширине и длине усиления.
+    """
+    FIELDS = ('deflection', 'reduction', 'area', 'efficiency')
+
+    def __init__(self, slab, widths_mm, thicknesses_mm, lengths_percent, tape_counts=(1,)):
+        self.slab = as_slab(slab)
+        self.widths_mm = np.asarray(widths_mm, dtype=float)
+        self.thicknesses_mm = np.asarray(thicknesses_mm, dtype=float)
+        self.lengths_percent = np.asarray(lengths_percent, dtype=float)
+        self.tape_counts = np.asarray(tape_counts, dtype=float)
+
+        results = calculate_design_grid(
+            self.slab, self.widths_mm, self.thicknesses_mm,
+            self.lengths_percent, self.tape_counts)
+        self.base_deflection = results['base_deflection']
+        self.fields = {name: np.ascontiguousarray(results[name], dtype=np.float32)
+                       for name in self.FIELDS}
+        self.layers = np.asarray(results['layers'][0, :, 0, 0], dtype=np.int16)
+
+        self._width_index = {float(v): i for i, v in enumerate(self.widths_mm)}
+        self._length_index = {float(v): i for i, v in enumerate(self.lengths_percent)}
+        self._tape_index = {float(v): i for i, v in enumerate(self.tape_counts)}
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.fields.values()) + self.layers.nbytes
+
+    def lookup(self, width_mm, length_percent, tape_count=1):
+        """Результаты для всех толщин сетки при заданной ширине и длине"""
+        k = self._tape_index[float(tape_count)]
+        i = self._width_index.get(float(width_mm))
+        j = self._length_index.get(float(length_percent))
+
+        if i is not None and j is not None:
+            result = {name: values[i, :, j, k] for name, values in self.fields.items()}
+        else:
+            wi, wi1, wt = _bracket(self.widths_mm, float(width_mm))
+            li, li1, lt = _bracket(self.lengths_percent, float(length_percent))
+            result = {}
+            for name, values in self.fields.items():
+                by_width = values[wi, :, :, k] * (1 - wt) + values[wi1, :, :, k] * wt
+                result[name] = by_width[:, li] * (1 - lt) + by_width[:, li1] * lt
+
+        result['layers'] = self.layers
+        result['base_deflection'] = self.base_deflection
+        return result
+
+
+class LRUCache:
+    """Ограниченный кэш с вытеснением давно не использованных записей"""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, compute):
+        """Значение по ключу; при промахе вычисляется compute() и запоминается"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = compute()
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+
+class DesignCache:
+    """LRU-кэш моментов инерции и прогибов
+
+    Ключ - неизменяемый снимок параметров плиты (SlabParams) и описание
+    усиления. При обращении с другими параметрами плиты кэш очищается,
+    поэтому изменение slab_params автоматически делает его недействительным.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.inertia_cache = LRUCache(maxsize)
+        self.deflection_cache = LRUCache(maxsize)
+        self._slab = None
+
+    def _check_slab(self, slab):
+        slab = as_slab(slab)
+        if slab != self._slab:
+            self.clear()
+            self._slab = slab
+        return slab
+
+    def clear(self):
+        self.inertia_cache.clear()
+        self.deflection_cache.clear()
+
+    def inertia(self, slab, carbon_area=0, carbon_thickness=0):
+        slab = self._check_slab(slab)
+        return self.inertia_cache.get(
+            (slab, carbon_area, carbon_thickness),
+            lambda: float(calculate_inertia(slab, carbon_area, carbon_thickness)))
+
+    def deflection(self, slab, reinforcement, method="analytic"):
+        slab = self._check_slab(slab)
+
+        def compute():
+            if method != "analytic":
+                return calculate_deflection(slab, reinforcement, method)
+            I = self.inertia(slab, reinforcement.carbon_area, reinforcement.thickness)
+            return midspan_deflection(
+                slab, reinforcement.length_percent, I, self.inertia(slab))
+
+        return self.deflection_cache.get((slab, reinforcement, method), compute)
+
+    def stats(self):
+        """Счетчики попаданий и промахов"""
+        return {
+            name: {'hits': cache.hits, 'misses': cache.misses,
+                   'size': len(cache), 'maxsize': cache.maxsize}
+            for name, cache in (('inertia', self.inertia_cache),
+                                ('deflection', self.deflection_cache))
+        }
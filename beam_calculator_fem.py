@@ -0,0 +1,367 @@
+"""Конечно-элементный расчет балки (Эйлер-Бернулли) с ленточной матрицей
+
+Балка делится на двухузловые элементы, жесткость каждого элемента берется
+из участков EI расчетного ядра (beam_calculator_core.reinforcement_segments
+и др.). Используется смешанная формулировка: неизвестные в узле - прогиб
+и изгибающий момент, уравнения узла - равновесие сил и непрерывность угла
+поворота, записанные точно для элемента с постоянными EI и нагрузкой
+(узловые значения совпадают с решением на эрмитовых элементах). Матрица
+имеет полуширину ленты 3 и решается scipy.linalg.solve_banded за O(n).
+
+Обычная матрица жесткости по прогибам и углам обусловлена как n⁴ и уже при
+~10⁴ элементов теряет все знаки двойной точности; обусловленность смешанной
+системы растет как n², поэтому и десятки тысяч элементов на пролет
+считаются за миллисекунды без потери точности.
+
+Опоры задаются для каждого опорного узла: "pin" (шарнир), "fixed" (заделка),
+"free" (свободный конец). Консоль - ("fixed", "free"), неразрезная балка -
+несколько пролетов с промежуточными шарнирными опорами.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+import beam_calculator_core as core
+
+SUPPORTS = ("pin", "fixed", "free")
+
+# Полуширина ленты матрицы (2 неизвестных в узле)
+_BAND = 3
+
+
+@dataclass(frozen=True)
+class BeamSolution:
+    """Результат расчета: узлы x (м), прогиб (мм, вниз положительный),
+    угол поворота (рад), момент (Н·м, растяжение снизу положительное),
+    поперечная сила (Н) и реакции опор (Н, вверх положительные)"""
+    x: np.ndarray
+    deflection: np.ndarray
+    rotation: np.ndarray
+    moment: np.ndarray
+    shear: np.ndarray
+    support_x: np.ndarray
+    reactions: np.ndarray
+
+
+def build_mesh(spans, segments=(), elements_per_span=1000, extra_points=()):
+    """Узлы сетки: равномерно по каждому пролету плюс границы участков EI
+    и дополнительные точки (изломы нагрузки, сосредоточенные силы)"""
+    spans = np.atleast_1d(np.asarray(spans, dtype=float))
+    support_x = np.concatenate(([0.0], np.cumsum(spans)))
+    nodes = [np.linspace(x0, x1, elements_per_span + 1)
+             for x0, x1 in zip(support_x[:-1], support_x[1:])]
+    nodes.append([x for segment in segments for x in segment[:2]])
+    nodes.append(np.clip(extra_points, 0, support_x[-1]))
+    x = np.unique(np.concatenate(nodes))
+    # Слияние почти совпадающих узлов (погрешность округления границ)
+    keep = np.concatenate(([True], np.diff(x) > 1e-9 * support_x[-1]))
+    return x[keep], support_x
+
+
+def element_inertia(slab, x, segments=None):
+    """Жесткость EI элементов по участкам (по середине элемента)
+
+    segments=None - неусиленное сечение по всей длине.
+    """
+    slab = core.as_slab(slab)
+    middles = (x[:-1] + x[1:]) / 2
+    if segments is None:
+        return np.full(len(middles), slab.E_concrete * float(core.calculate_inertia(slab)))
+    lo, hi, EI = core.segment_arrays(x[-1], segments)
+    index = np.clip(np.searchsorted(hi, middles), 0, len(EI) - 1)
+    return EI[index]
+
+
+def _support_kinds(x, support_x, supports):
+    """Тип опоры в каждом узле сетки (None - без опоры) и опорные узлы"""
+    if len(supports) != len(support_x):
+        raise ValueError(
+            f"Нужно {len(support_x)} опор для {len(support_x) - 1} пролетов, задано {len(supports)}")
+    kinds = np.full(len(x), None, dtype=object)
+    nodes = []
+    for xs, kind in zip(support_x, supports):
+        if kind not in SUPPORTS:
+            raise ValueError(f"Неизвестный тип опоры: {kind}")
+        node = int(np.argmin(np.abs(x - xs)))
+        kinds[node] = kind
+        nodes.append(node)
+    # Неразрезной балке достаточно двух любых закреплений (прогиб или угол)
+    if sum((kind != "free") + (kind == "fixed") for kind in supports) < 2:
+        raise ValueError("Схема опирания геометрически изменяема")
+    return kinds, np.array(nodes)
+
+
+class _BeamSystem:
+    """Собранная ленточная система смешанного МКЭ для набора нагружений
+
+    Неизвестные узла i: z[2i] - прогиб (м), z[2i + 1] - момент справа от узла
+    в долях moment_scale. В промежуточной заделке прогиб равен нулю, а ячейка
+    z[2i] хранит момент слева от узла (заделка дает скачок эпюры моментов).
+    """
+
+    def __init__(self, slab, segments=None, supports=("pin", "pin"), spans=None,
+                 elements_per_span=1000, extra_points=()):
+        slab = core.as_slab(slab)
+        if spans is None:
+            spans = [slab.span_length]
+
+        self.slab = slab
+        self.x, self.support_x = build_mesh(
+            spans, segments or (), elements_per_span, extra_points)
+        h = self.h = np.diff(self.x)
+        EI = element_inertia(slab, self.x, segments)
+        kinds, self.support_nodes = _support_kinds(self.x, self.support_x, supports)
+        self.free_supports = kinds[self.support_nodes] == "free"
+
+        nodes = np.arange(len(self.x))
+        last = nodes[-1]
+        interior = (nodes > 0) & (nodes < last)
+        self.clamped = interior & (kinds == "fixed")
+        pinned = interior & (kinds == "pin")
+        unsupported = interior & ~self.clamped & ~pinned
+
+        # Масштаб моментов, при котором коэффициенты уравнений одного порядка
+        self.moment_scale = s = float(np.mean(EI) / np.mean(h) ** 2)
+
+        # Столбцы неизвестных на концах элементов (-1 - нулевой прогиб заделки)
+        left, right = nodes[:-1], nodes[1:]
+        self.columns = {
+            'w_left': np.where(self.clamped[left], -1, 2 * left),
+            'w_right': np.where(self.clamped[right], -1, 2 * right),
+            'm_left': 2 * left + 1,
+            'm_right': np.where(self.clamped[right], 2 * right, 2 * right + 1),
+        }
+        # Углы поворота и поперечные силы на концах элементов - линейные
+        # функции неизвестных и нагрузки элемента: (коэффициенты, доля q)
+        a = h / EI * s
+        self.terms = {
+            'rotation_start': ({'w_left': -1 / h, 'w_right': 1 / h, 'm_left': a / 3, 'm_right': a / 6},
+                               h**3 / (24 * EI)),
+            'rotation_end': ({'w_left': -1 / h, 'w_right': 1 / h, 'm_left': -a / 6, 'm_right': -a / 3},
+                             -h**3 / (24 * EI)),
+            'shear_start': ({'m_left': -s / h, 'm_right': s / h}, h / 2),
+            'shear_end': ({'m_left': -s / h, 'm_right': s / h}, -h / 2),
+        }
+
+        # Уравнения: z[2i] - кинематическое, z[2i + 1] - статическое для узла i
+        self.ab = np.zeros((2 * _BAND + 1, 2 * len(self.x)))
+        self._load_rows, self._load_elements, self._load_coef = [], [], []
+        i = nodes[interior & ~self.clamped]
+        self._add(2 * i, 'rotation_end', i - 1)
+        self._add(2 * i, 'rotation_start', i, -1)
+        i = nodes[self.clamped]
+        self._add(2 * i, 'rotation_end', i - 1)
+        self._add(2 * i + 1, 'rotation_start', i)
+        self._unit(2 * nodes[pinned] + 1, 2 * nodes[pinned])
+        i = nodes[unsupported]
+        self._add(2 * i + 1, 'shear_start', i)
+        self._add(2 * i + 1, 'shear_end', i - 1, -1)
+        equilibrium = list(i)
+
+        # Концы балки: заделка - нулевые прогиб и угол, шарнир - нулевые
+        # прогиб и момент, свободный конец - нулевые момент и поперечная сила
+        for node, element, rotation, shear, sign in (
+                (0, 0, 'rotation_start', 'shear_start', 1),
+                (last, last - 1, 'rotation_end', 'shear_end', -1)):
+            node_array, element_array = np.array([node]), np.array([element])
+            if kinds[node] == "fixed":
+                self._add(2 * node_array, rotation, element_array)
+            else:
+                self._unit(2 * node_array, 2 * node_array + 1)
+            if kinds[node] == "free":
+                self._add(2 * node_array + 1, shear, element_array, sign)
+                equilibrium.append(node)
+            else:
+                self._unit(2 * node_array + 1, 2 * node_array)
+        self._equilibrium = np.array(equilibrium, dtype=int)
+
+        # Строки нормируются на наибольший коэффициент
+        n_dof = self.ab.shape[1]
+        columns = np.arange(n_dof)
+        row_max = np.zeros(n_dof)
+        for band in range(2 * _BAND + 1):
+            rows = columns + band - _BAND
+            valid = (rows >= 0) & (rows < n_dof)
+            np.maximum.at(row_max, rows[valid], np.abs(self.ab[band, valid]))
+        self.row_scale = 1 / row_max
+        for band in range(2 * _BAND + 1):
+            rows = np.clip(columns + band - _BAND, 0, n_dof - 1)
+            self.ab[band] *= self.row_scale[rows]
+        self._load_rows = np.concatenate(self._load_rows)
+        self._load_elements = np.concatenate(self._load_elements)
+        self._load_coef = np.concatenate(self._load_coef)
+
+    def _unit(self, rows, columns):
+        """Уравнения вида z[column] = 0"""
+        self.ab[_BAND + rows - columns, columns] += 1.0
+
+    def _add(self, rows, term, elements, sign=1):
+        """Добавление концевой величины элементов в уравнения rows"""
+        coefficients, load = self.terms[term]
+        for key, values in coefficients.items():
+            columns = self.columns[key][elements]
+            valid = columns >= 0
+            np.add.at(self.ab, (_BAND + rows[valid] - columns[valid], columns[valid]),
+                      sign * values[elements][valid])
+        self._load_rows.append(rows)
+        self._load_elements.append(elements)
+        self._load_coef.append(sign * load[elements])
+
+    def _end_values(self, term, z, q):
+        """Концевая величина всех элементов по решению z и нагрузке q"""
+        coefficients, load = self.terms[term]
+        value = load.reshape(q.shape[:1] + (1,) * (q.ndim - 1)) * q
+        for key, values in coefficients.items():
+            value = value + values.reshape(value.shape[:1] + (1,) * (z.ndim - 1)) * z[self.columns[key]]
+        return value
+
+    def solve(self, q=0.0, p=0.0):
+        """Решение для нагрузки q по элементам (Н/м) и узловых сил p (Н)
+
+        q - число или значения по элементам, p - значения по узлам или
+        матрица со столбцами-нагружениями. Возвращает прогибы (м), углы
+        поворота, моменты и поперечные силы в узлах и реакции опор;
+        при нескольких нагружениях - по столбцам.
+        """
+        from scipy.linalg import solve_banded
+
+        p = np.asarray(p, dtype=float)
+        p = np.broadcast_to(p, self.x.shape + p.shape[1:])
+        trailing = (1,) * (p.ndim - 1)
+        q = np.broadcast_to(np.asarray(q, dtype=float), self.h.shape).reshape(self.h.shape + trailing)
+
+        rhs = np.zeros((self.ab.shape[1],) + p.shape[1:])
+        np.subtract.at(rhs, self._load_rows,
+                       self._load_coef.reshape((-1,) + trailing) * q[self._load_elements])
+        np.subtract.at(rhs, 2 * self._equilibrium + 1, p[self._equilibrium])
+        z = solve_banded((_BAND, _BAND), self.ab, rhs * self.row_scale.reshape((-1,) + trailing))
+
+        # Нулевая строка в конце: столбец -1 (прогиб заделки) дает ноль
+        z = np.concatenate((z, np.zeros((1,) + z.shape[1:])))
+        deflection = z[0:-1:2].copy()
+        deflection[self.clamped] = 0
+        moment = z[1::2] * self.moment_scale
+        moment_end = z[self.columns['m_right']] * self.moment_scale
+        rotation_end = self._end_values('rotation_end', z, q)
+        rotation = np.concatenate((self._end_values('rotation_start', z, q), rotation_end[-1:]))
+
+        # Поперечные силы - из статики каждого участка между опорными узлами:
+        # сила в начале участка из равновесия моментов, далее вычитается
+        # накопленная нагрузка (разность моментов соседних узлов на мелкой
+        # сетке теряет точность)
+        x = self.x
+        element_load = np.broadcast_to(
+            q * self.h.reshape((-1,) + trailing), self.h.shape + p.shape[1:])
+        shear_start = np.empty(element_load.shape)
+        for a, b in zip(self.support_nodes[:-1], self.support_nodes[1:]):
+            arm = (x[b] - (x[a:b] + x[a + 1:b + 1]) / 2).reshape((-1,) + trailing)
+            inner_arm = (x[b] - x[a + 1:b]).reshape((-1,) + trailing)
+            load_moment = (element_load[a:b] * arm).sum(axis=0) + (p[a + 1:b] * inner_arm).sum(axis=0)
+            start = (moment_end[b - 1] - moment[a] + load_moment) / (x[b] - x[a])
+            steps = np.cumsum(element_load[a:b - 1] + p[a + 1:b], axis=0)
+            shear_start[a:b] = start
+            shear_start[a + 1:b] -= steps
+        shear_end = shear_start - element_load
+        shear = np.concatenate((shear_start, shear_end[-1:]))
+
+        # Реакции - скачок поперечной силы в опорном узле
+        zero = np.zeros((1,) + shear.shape[1:])
+        right = np.concatenate((shear_start, zero))
+        left = np.concatenate((zero, shear_end))
+        nodes = self.support_nodes
+        reactions = right[nodes] - left[nodes] + p[nodes]
+        reactions[self.free_supports] = 0
+        return deflection, rotation, moment, shear, reactions
+
+
+def solve_beam(slab, segments=None, supports=("pin", "pin"), spans=None,
+               q=None, elements_per_span=1000, loads=None):
+    """Прогибы, моменты, поперечные силы и реакции балки методом конечных элементов
+
+    slab - параметры плиты (словарь или SlabParams);
+    segments - участки [(x0, x1, EI), ...] по всей длине балки
+    (None - неусиленное сечение);
+    supports - тип каждой опоры ("pin", "fixed", "free") от левого конца;
+    spans - длины пролетов, м (по умолчанию один пролет span_length);
+    q - равномерная нагрузка, Н/м (по умолчанию q_load), число или массив
+    значений по элементам;
+    loads - произвольные нагрузки core.Loads (заменяют q): узлы сетки
+    ставятся во все точки излома нагрузки, распределенная нагрузка берется
+    по середине элемента, сосредоточенные силы - в узлах.
+    """
+    extra_points = () if loads is None else loads.breakpoints()
+    system = _BeamSystem(slab, segments, supports, spans, elements_per_span, extra_points)
+    if loads is not None:
+        x = system.x
+        q = loads.intensity((x[:-1] + x[1:]) / 2)
+    elif q is None:
+        q = system.slab.q_load
+
+    p = np.zeros(len(system.x))
+    for x, P in (() if loads is None else loads.point):
+        p[int(np.argmin(np.abs(system.x - x)))] += P
+    deflection, rotation, moment, shear, reactions = system.solve(q, p)
+
+    return BeamSolution(
+        x=system.x,
+        deflection=deflection * 1000,
+        rotation=rotation,
+        moment=moment,
+        shear=shear,
+        support_x=system.support_x,
+        reactions=reactions,
+    )
+
+
+class InfluenceModel:
+    """Отклики балки на единичные нагрузки для мгновенного расчета сочетаний
+
+    Задача линейна, поэтому для заданного усиления один раз решаются
+    единичная равномерная нагрузка и единичная сила в каждом узле сетки.
+    Прогибы (мм), моменты (Н·м) и поперечные силы (Н) в узлах для любого
+    набора нагрузок - одно произведение матрицы на вектор.
+    """
+
+    def __init__(self, slab, segments=None, supports=("pin", "pin"), spans=None,
+                 elements_per_span=200):
+        system = _BeamSystem(slab, segments, supports, spans, elements_per_span)
+        self.x = system.x
+        self.support_x = system.support_x
+        n_nodes = len(self.x)
+
+        # Единичная равномерная нагрузка по всей длине
+        deflection, _, moment, shear, _ = system.solve(q=1.0)
+        self.uniform = {'deflection': deflection * 1000, 'moment': moment, 'shear': shear}
+
+        # Единичная сила в каждом узле (столбцы матриц влияния)
+        deflection, _, moment, shear, _ = system.solve(p=np.eye(n_nodes))
+        self.point = {'deflection': deflection * 1000, 'moment': moment, 'shear': shear}
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for part in (self.uniform, self.point) for v in part.values())
+
+    def nodal_loads(self, point_loads):
+        """Вектор узловых сил: сила между узлами делится по правилу рычага"""
+        p = np.zeros(len(self.x))
+        for x, P in point_loads:
+            i = int(np.clip(np.searchsorted(self.x, x) - 1, 0, len(self.x) - 2))
+            t = float(np.clip((x - self.x[i]) / (self.x[i + 1] - self.x[i]), 0, 1))
+            p[i] += P * (1 - t)
+            p[i + 1] += P * t
+        return p
+
+    def evaluate(self, q=0.0, point_loads=()):
+        """Прогибы, моменты и поперечные силы в узлах от равномерной нагрузки q
+        (Н/м) и сосредоточенных сил [(x, P), ...] (Н, вниз положительные)"""
+        p = self.nodal_loads(point_loads)
+        return {name: q * self.uniform[name] + self.point[name] @ p
+                for name in self.uniform}
+
+    def evaluate_cases(self, cases):
+        """Отклики сразу для нескольких сочетаний [(q, point_loads), ...];
+        результат - массивы формы (узлы, сочетания)"""
+        q = np.array([case[0] for case in cases], dtype=float)
+        P = np.column_stack([self.nodal_loads(case[1]) for case in cases])
+        return {name: self.uniform[name][:, None] * q + self.point[name] @ P
+                for name in self.uniform}
@@ -1,20 +1,27 @@
-import matplotlib.patches as patches
-import matplotlib.pyplot as plt
-from scipy.interpolate import make_interp_spline
+import time
+_STARTUP_T0 = time.perf_counter()  # Начало запуска (метрика time-to-first-paint)
+
+# Тяжелые модули (matplotlib.pyplot/patches, pandas, scipy) импортируются
+# при первом использовании, чтобы окно появлялось сразу
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.transforms import Bbox
+import queue
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import numpy as np
-from scipy.integrate import quad
-import pandas as pd
-import math
-from math import ceil
 import matplotlib
 matplotlib.use('TkAgg')
 
+import beam_calculator_core as core
+import beam_calculator_fem as fem
+from beam_calculator_store import ResultStore
+from beam_calculator_table import VirtualTable
+
 class BeamCalculatorApp:
-    def __init__(self, root):
+    def __init__(self, root, lazy_startup=True):
         self.root = root
         self.root.title("Расчет усиления углепластиком")
         self.root.geometry("1800x1200")
@@ -22,29 +29,104 @@ class BeamCalculatorApp:
         # Константы
         self.LAYER_THICKNESS = 0.0004
 
+        # Метод расчета прогиба: "analytic" - точные первообразные по участкам,
+        # "reference" - численное интегрирование scipy.integrate.quad (для сверки)
+        self.deflection_method = "analytic"
+
+        # Фоновые расчеты: пул потоков и очередь результатов, которая
+        # опрашивается из главного цикла Tk
+        self.JOB_POLL_MS = 15
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job_results = queue.Queue()
+        self._job_ids = {}
+        self._pending_jobs = {}
+        self._polling = False
+
+        # LRU-кэш сечений и прогибов (сбрасывается при изменении slab_params)
+        self.design_cache = core.DesignCache()
+        # Отклики на единичные нагрузки для сочетаний (по усилению и схеме);
+        # кэш используется только фоновым потоком. Ключ входных данных
+        # последней отрисовки вкладки сочетаний
+        self.influence_cache = core.LRUCache(maxsize=8)
+        self._load_cases_key = None
+
+        # Постоянное хранилище результатов между сеансами
+        try:
+            self.store = ResultStore()
+        except sqlite3.Error as e:
+            print(f"Хранилище результатов недоступно: {e}")
+            self.store = None
+
+        # Разрешение эпюр (число точек по длине пролета и высоте сечения)
+        self.EPURE_POINTS = 1000
+
+        # Предрасчитанная поверхность результатов (core.DesignSurface)
+        self.surface = None
+        self._surface_slab = None
+
+        # Частота обработки событий ползунков (одно обновление за кадр)
+        self.FRAME_MS = 16
+        self._coalesced = {}
+
         # Параметры плиты
-        self.slab_params = {
-            'width': 1.2,
-            'height': 0.265,
-            'n_voids': 5,
-            'void_radius': 0.075,
-            'void_rect_height': 0.055,
-            'E_concrete': 3e10,
-            'E_carbon': 1.65e11,
-            'q_load': 10602,
-            'span_length': 9.4
-        }
+        # (значения по умолчанию задаются в расчетном ядре)
+        self.slab_params = core.SlabParams().as_dict()
 
         # Диапазоны параметров
         self.width_options = [50, 100, 150, 200, 250, 300]
         self.thickness_options = list(range(0, 11))
         self.length_options = list(range(0, 101, 5))
+        self.tape_count_options = [1, 2, 3]
+
+        # Столбцы таблицы результатов: текущий вариант и весь каталог
+        self.result_columns = [
+            ("thickness_mm", "Толщина (мм)", "{:g}"),
+            ("deflection", "Прогиб (мм)", "{:.2f}"),
+            ("reduction", "Снижение (%)", lambda v: f"{v:.1f}" if v > 0 else "0.0"),
+            ("layers", "Слоёв", "{}"),
+            ("area", "Площадь (м²)", "{:.4f}"),
+            ("efficiency", "Эффективность (%/м²)", lambda v: f"{v:.4f}" if v > 0 else "-"),
+        ]
+        self.catalogue_columns = [
+            ("width_mm", "Ширина (мм)", "{:g}"),
+            ("length_percent", "Длина (%)", "{:g}"),
+            ("tape_count", "Лент", "{}"),
+        ] + self.result_columns
+
+        # Подбор усиления: вид цели и критерий (площадь или стоимость)
+        self.optimize_targets = ["Снижение прогиба ≥ (%)", "Прогиб ≤ (мм)", "Прогиб ≤ L/"]
+        self.optimize_objectives = {"Минимальная площадь": "area", "Минимальная стоимость": "cost"}
+        self.material_cost = 4000   # стоимость 1 м² слоя углепластика, руб.
+        self.labor_cost = 1500      # стоимость наклейки 1 м ленты, руб.
+
+        # Разброс параметров плиты для расчета надежности:
+        # {параметр: (распределение, среднее или min, ст. отклонение или max)}
+        q = self.slab_params['q_load']
+        self.reliability_distributions = {
+            'E_concrete': ("lognormal", self.slab_params['E_concrete'], 0.1 * self.slab_params['E_concrete']),
+            'E_carbon': ("lognormal", self.slab_params['E_carbon'], 0.05 * self.slab_params['E_carbon']),
+            'q_load': ("normal", q, 0.1 * q),
+            'height': ("normal", self.slab_params['height'], 0.005),
+        }
+        self.RELIABILITY_SAMPLES = 200_000
+
+        # Схемы опирания для эпюр: опоры слева направо и число пролетов
+        # (кроме шарнирного опирания эпюры строятся методом конечных элементов)
+        self.support_schemes = {
+            "Шарнир – шарнир": (("pin", "pin"), 1),
+            "Заделка – шарнир": (("fixed", "pin"), 1),
+            "Заделка – заделка": (("fixed", "fixed"), 1),
+            "Консоль": (("fixed", "free"), 1),
+            "Неразрезная, 2 пролета": (("pin", "pin", "pin"), 2),
+            "Неразрезная, 3 пролета": (("pin", "pin", "pin", "pin"), 3),
+        }
 
         # Переменные для графиков
         self.current_width = 100
         self.current_length = 30
+        self.current_tape_count = 1
         self.current_thickness = 0
-        self.graph_data = []
+        self.results = core.DesignResults()
         self.base_deflection = None
 
         # Основной контейнер
@@ -59,15 +141,31 @@ class BeamCalculatorApp:
         self.tab1 = ttk.Frame(self.notebook)
         self.tab2 = ttk.Frame(self.notebook)
         self.tab3 = ttk.Frame(self.notebook)
+        self.tab4 = ttk.Frame(self.notebook)
 
         self.notebook.add(self.tab1, text="Основные расчеты")
         self.notebook.add(self.tab2, text="График эффективности")
         self.notebook.add(self.tab3, text="Эпюры M, Q и прогибов")
+        self.notebook.add(self.tab4, text="Сочетания нагрузок")
 
-        # Создаем содержимое вкладок
+        # Создаем содержимое вкладок. В режиме быстрого запуска сразу
+        # строится только первая вкладка, остальные - после первой отрисовки
+        # окна или при переключении на них
+        self.time_to_first_paint = None
+        self._deferred_tabs = {}
         self.create_tab1_content(self.tab1)
-        self.create_tab2_content(self.tab2)
-        self.create_tab3_content(self.tab3)
+        if lazy_startup:
+            self._deferred_tabs = {
+                str(self.tab2): (self.tab2, self.create_tab2_content),
+                str(self.tab3): (self.tab3, self.create_tab3_content),
+                str(self.tab4): (self.tab4, self.create_tab4_content),
+            }
+        else:
+            self.create_tab2_content(self.tab2)
+            self.create_tab3_content(self.tab3)
+            self.create_tab4_content(self.tab4)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.root.bind("<Map>", self._on_first_paint, add="+")
 
         # Привязка клавиш масштабирования
         self.section_zoom = 1.0  # Инициализация переменной масштаба
@@ -80,6 +178,38 @@ class BeamCalculatorApp:
         self.calculate_base_deflection()
         self.update_info()
 
+    def _on_first_paint(self, event=None):
+        """Фиксация времени до первой отрисовки окна"""
+        if self.time_to_first_paint is not None or event.widget is not self.root:
+            return
+        self.root.update_idletasks()
+        self.time_to_first_paint = time.perf_counter() - _STARTUP_T0
+        self.update_info()
+        self.restore_last_design()
+        self.precompute_surface()
+        self.root.after(1, self._build_next_deferred_tab)
+
+    def _on_tab_changed(self, event=None):
+        """Построение отложенной вкладки при переключении на нее и обновление
+        сочетаний, если их входные данные изменились, пока вкладка была скрыта"""
+        self._build_deferred_tabs(self.notebook.select())
+        if hasattr(self, 'cases_tree'):
+            self.update_load_cases()
+
+    def _build_next_deferred_tab(self):
+        """Фоновое построение отложенных вкладок по одной за цикл событий"""
+        if self._deferred_tabs:
+            self._build_deferred_tabs(next(iter(self._deferred_tabs)))
+            self.root.after(1, self._build_next_deferred_tab)
+
+    def _build_deferred_tabs(self, tab=None):
+        """Построение отложенных вкладок (всех или только указанной)"""
+        keys = [str(tab)] if tab is not None else list(self._deferred_tabs)
+        for key in keys:
+            if key in self._deferred_tabs:
+                frame, builder = self._deferred_tabs.pop(key)
+                builder(frame)
+
     def zoom_in(self, event=None):
         """Увеличение масштаба"""
         self.zoom_section(1.1)
@@ -100,12 +230,37 @@ class BeamCalculatorApp:
 
             if abs(new_zoom - self.section_zoom) > 0.01:
                 self.section_zoom = new_zoom
-                self.draw_section_plot()
-            if hasattr(self, 'canvas_epure'):
-                self.canvas_epure.draw()
+                if getattr(self, '_section_geometry_key', None) is not None:
+                    self._schedule_coalesced("section_zoom", self._redraw_section_zoom)
         except Exception as e:
             print(f"Zoom error: {e}")
 
+    def _redraw_section_zoom(self):
+        """Перерисовка только схемы сечения (вместе с сеткой и рисками осей)
+        поверх фона, сохраненного при последней полной отрисовке"""
+        if self._section_background is None:
+            self.canvas_epure.draw_idle()
+            return
+        self._apply_section_zoom()
+        self.canvas_epure.restore_region(self._section_background)
+        self.figure_epure.draw_artist(self.epure_section_plot)
+        self.canvas_epure.blit(self._section_region)
+
+    def _on_epure_draw(self, event):
+        """После полной отрисовки эпюр: сохранение фона под анимируемыми
+        элементами (схема сечения, подпись под курсором) и их отрисовка"""
+        if self._stress_map_image is not None:
+            self._stress_map_background = self.canvas_epure.copy_from_bbox(
+                self.epure_stress_map_plot.bbox.padded(2))
+            self.figure_epure.draw_artist(self._stress_map_readout)
+            self._stress_map_readout_extent = self._stress_map_readout.get_window_extent()
+        if getattr(self, '_section_geometry_key', None) is not None:
+            ax = self.epure_section_plot
+            # Область с заголовком и рисками осей
+            self._section_region = ax.get_tightbbox(event.renderer).padded(5)
+            self._section_background = self.canvas_epure.copy_from_bbox(self._section_region)
+            self.figure_epure.draw_artist(ax)
+
     def calculate_base_deflection(self):
         """Расчет прогиба без усиления"""
         try:
@@ -151,51 +306,65 @@ class BeamCalculatorApp:
                                       values=self.length_options, state="readonly")
         length_combobox.grid(row=1, column=1, padx=5, pady=5)
 
+        ttk.Label(param_frame, text="Количество лент:").grid(row=2, column=0, padx=5, pady=5)
+        self.tape_count_var = tk.StringVar(value="1")
+        ttk.Combobox(param_frame, textvariable=self.tape_count_var,
+                     values=self.tape_count_options, state="readonly").grid(
+            row=2, column=1, padx=5, pady=5)
+
         ttk.Button(
     param_frame,
     text="Рассчитать",
     command=self.calculate).grid(
-        row=2,
+        row=3,
         column=0,
         columnspan=2,
          pady=10)
 
+        # Подбор усиления минимальной площади или стоимости
+        ttk.Separator(param_frame, orient="horizontal").grid(
+            row=4, column=0, columnspan=2, sticky="ew", pady=5)
+        self.optimize_target_var = tk.StringVar(value=self.optimize_targets[0])
+        ttk.Combobox(param_frame, textvariable=self.optimize_target_var,
+                     values=self.optimize_targets, state="readonly").grid(
+            row=5, column=0, padx=5, pady=5)
+        self.optimize_value_var = tk.StringVar(value="5")
+        ttk.Entry(param_frame, textvariable=self.optimize_value_var).grid(
+            row=5, column=1, padx=5, pady=5)
+
+        ttk.Label(param_frame, text="Критерий:").grid(row=6, column=0, padx=5, pady=5)
+        self.optimize_objective_var = tk.StringVar(value=next(iter(self.optimize_objectives)))
+        ttk.Combobox(param_frame, textvariable=self.optimize_objective_var,
+                     values=list(self.optimize_objectives), state="readonly").grid(
+            row=6, column=1, padx=5, pady=5)
+
+        ttk.Button(param_frame, text="Подобрать усиление",
+                   command=self.optimize).grid(row=7, column=0, columnspan=2, pady=10)
+
+        # Вероятностный расчет прогиба (Монте-Карло) для всех толщин
+        ttk.Separator(param_frame, orient="horizontal").grid(
+            row=8, column=0, columnspan=2, sticky="ew", pady=5)
+        ttk.Label(param_frame, text="Предельный прогиб L/").grid(row=9, column=0, padx=5, pady=5)
+        self.reliability_ratio_var = tk.StringVar(value="250")
+        ttk.Entry(param_frame, textvariable=self.reliability_ratio_var).grid(
+            row=9, column=1, padx=5, pady=5)
+        ttk.Button(param_frame, text="Надежность (Монте-Карло)",
+                   command=self.run_reliability).grid(row=10, column=0, columnspan=2, pady=10)
+
         # Таблица результатов
         result_frame = ttk.LabelFrame(
     parent, text="Результаты для всех толщин")
         result_frame.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
 
-        columns = (
-    "thickness",
-    "deflection",
-    "reduction",
-    "layers",
-    "area",
-     "efficiency")
-        self.tree = ttk.Treeview(
-    result_frame,
-    columns=columns,
-    show="headings",
-     height=15)
-
-        # Настройка колонок
-        self.tree.heading("thickness", text="Толщина (мм)")
-        self.tree.heading("deflection", text="Прогиб (мм)")
-        self.tree.heading("reduction", text="Снижение (%)")
-        self.tree.heading("layers", text="Слоёв")
-        self.tree.heading("area", text="Площадь (м²)")
-        self.tree.heading("efficiency", text="Эффективность (%/м²)")
-
-        for col in columns:
-            self.tree.column(col, width=100, anchor="center")
-
-        scrollbar = ttk.Scrollbar(
-    result_frame,
-    orient="vertical",
-     command=self.tree.yview)
-        scrollbar.pack(side="right", fill="y")
+        # Виртуальная таблица: в Treeview только видимые строки, сортировка
+        # щелчком по заголовку, фильтр вида "reduction > 20 and area < 1.5"
+        self.tree = VirtualTable(result_frame, self.result_columns)
         self.tree.pack(fill="both", expand=True)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.catalogue_mode = False
+        self.catalogue_button = ttk.Button(
+            result_frame, text="Показать весь каталог вариантов", command=self.toggle_catalogue)
+        self.catalogue_button.pack(pady=2)
 
         # Информационная панель
         info_frame = ttk.LabelFrame(parent, text="Параметры системы")
@@ -220,6 +389,7 @@ class BeamCalculatorApp:
         self.canvas_deflection = FigureCanvasTkAgg(
             self.figure_deflection, master=graph_frame)
         self.canvas_deflection.get_tk_widget().pack(fill="both", expand=True)
+        self._init_deflection_artists()
 
         # Настройка размеров
         parent.columnconfigure(0, weight=1)
@@ -240,6 +410,7 @@ class BeamCalculatorApp:
         self.canvas_efficiency = FigureCanvasTkAgg(
     self.figure_efficiency, master=efficiency_frame)
         self.canvas_efficiency.get_tk_widget().pack(fill="both", expand=True)
+        self._init_efficiency_artists()
 
         # Панель управления для графика эффективности
         control_frame = ttk.Frame(efficiency_frame)
@@ -252,7 +423,7 @@ class BeamCalculatorApp:
         side="left",
          padx=5)
         self.width_slider_eff = ttk.Scale(control_frame, from_=50, to=300,
-                                        command=lambda e: self.update_efficiency_graph())
+                                        command=self._on_efficiency_slider)
         self.width_slider_eff.pack(side="left", fill="x", expand=True, padx=5)
         self.width_slider_eff.set(100)
 
@@ -263,10 +434,29 @@ class BeamCalculatorApp:
         side="left",
          padx=5)
         self.length_slider_eff = ttk.Scale(control_frame, from_=0, to=100,
-                                         command=lambda e: self.update_efficiency_graph())
+                                         command=self._on_efficiency_slider)
         self.length_slider_eff.pack(side="left", fill="x", expand=True, padx=5)
         self.length_slider_eff.set(30)
 
+        # Фронт Парето по всему каталогу вариантов
+        pareto_frame = ttk.LabelFrame(parent, text="Фронт Парето: площадь – прогиб – число слоев")
+        pareto_frame.pack(fill="both", expand=True, padx=5, pady=5)
+
+        self.figure_pareto = Figure(figsize=(10, 4), dpi=100)
+        self.pareto_plot = self.figure_pareto.add_subplot(111)
+        self.canvas_pareto = FigureCanvasTkAgg(self.figure_pareto, master=pareto_frame)
+        self.canvas_pareto.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas_pareto.mpl_connect('pick_event', self._on_pareto_pick)
+        self.pareto_catalogue = None
+
+        pareto_controls = ttk.Frame(pareto_frame)
+        pareto_controls.pack(fill="x", pady=5)
+        ttk.Button(pareto_controls, text="Построить фронт Парето",
+                   command=self.update_pareto_plot).pack(side="left", padx=5)
+        self.pareto_info = ttk.Label(
+            pareto_controls, text="Щелкните точку фронта, чтобы увидеть вариант")
+        self.pareto_info.pack(side="left", padx=5)
+
     def create_tab3_content(self, parent):
         """Создает вкладку с эпюрами (M, Q, прогибов, сечений и напряжений) с прокруткой"""
         # Основной контейнер
@@ -294,6 +484,19 @@ class BeamCalculatorApp:
         self.thickness_combobox_epure.bind(
     "<<ComboboxSelected>>", self.update_epures)
 
+        # Выбор схемы опирания
+        ttk.Label(control_frame, text="Схема опирания:").pack(side="left", padx=5)
+        self.support_scheme_var = tk.StringVar(value=next(iter(self.support_schemes)))
+        scheme_combobox = ttk.Combobox(
+            control_frame,
+            textvariable=self.support_scheme_var,
+            values=list(self.support_schemes),
+            state="readonly",
+            width=24
+        )
+        scheme_combobox.pack(side="left", padx=5)
+        scheme_combobox.bind("<<ComboboxSelected>>", self.update_epures)
+
         # Кнопка обновления
         ttk.Button(
     control_frame,
@@ -302,6 +505,30 @@ class BeamCalculatorApp:
         side="left",
          padx=5)
 
+        # Нагрузки: равномерная, сосредоточенные, на участках и таблица q(x)
+        loads_frame = ttk.LabelFrame(main_frame, text="Нагрузки")
+        loads_frame.pack(fill="x", padx=5, pady=5)
+
+        ttk.Label(loads_frame, text="q (Н/м):").pack(side="left", padx=5)
+        self.epure_q_var = tk.StringVar(value=str(self.slab_params['q_load']))
+        ttk.Entry(loads_frame, textvariable=self.epure_q_var, width=10).pack(side="left", padx=5)
+
+        ttk.Label(loads_frame, text="Силы x:P (м:Н; ...):").pack(side="left", padx=5)
+        self.epure_points_var = tk.StringVar()
+        ttk.Entry(loads_frame, textvariable=self.epure_points_var, width=20).pack(side="left", padx=5)
+
+        ttk.Label(loads_frame, text="Участки x0-x1:q (м:Н/м; ...):").pack(side="left", padx=5)
+        self.epure_patches_var = tk.StringVar()
+        ttk.Entry(loads_frame, textvariable=self.epure_patches_var, width=20).pack(side="left", padx=5)
+
+        self.epure_load_table = ()
+        ttk.Button(loads_frame, text="Таблица q(x)...",
+                   command=self.load_load_table).pack(side="left", padx=5)
+        ttk.Button(loads_frame, text="Сбросить таблицу",
+                   command=self.clear_load_table).pack(side="left", padx=5)
+        self.load_table_label = ttk.Label(loads_frame, text="таблица не загружена")
+        self.load_table_label.pack(side="left", padx=5)
+
         # 2. Область с прокруткой для графиков
         container = ttk.Frame(main_frame)
         container.pack(fill="both", expand=True)
@@ -345,9 +572,17 @@ class BeamCalculatorApp:
         self.epure_q_plot = self.figure_epure.add_subplot(322)
         # 3.3 Эпюра прогибов
         self.epure_deflection_plot = self.figure_epure.add_subplot(323)
-        # 3.4 Схема сечения (с лентой усиления)
+        # 3.4 Поле напряжений σ(x, y) по всему пролету
+        self.epure_stress_map_plot = self.figure_epure.add_subplot(324)
+        self._stress_map_image = None
+        self._stress_map_background = None
+        # 3.5 Схема сечения (с лентой усиления)
         self.epure_section_plot = self.figure_epure.add_subplot(325)
-        # 3.5 Эпюра напряжений (со ступенькой в углепластике)
+        # Схема не входит в полную отрисовку: при масштабировании она
+        # перерисовывается целиком поверх сохраненного фона (см. _on_epure_draw)
+        self.epure_section_plot.set_animated(True)
+        self._section_background = None
+        # 3.6 Эпюра напряжений (со ступенькой в углепластике)
         self.epure_stress_plot = self.figure_epure.add_subplot(326)
 
         # Встраивание графиков в интерфейс
@@ -356,265 +591,783 @@ class BeamCalculatorApp:
             master=self.epure_scrollable_frame
         )
         self.canvas_epure.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas_epure.mpl_connect('motion_notify_event', self._on_stress_map_motion)
+        self.canvas_epure.mpl_connect('draw_event', self._on_epure_draw)
         self.figure_epure.tight_layout()
 
-    def calculate_inertia(self, carbon_area=0, carbon_thickness=0):
-        """Пересчитанный метод с правильной геометрией пустот"""
-        # Момент инерции сплошного прямоугольника
-        I_solid = (self.slab_params['width'] *
-                   self.slab_params['height']**3) / 12
-
-        # Параметры пустоты
-        r = self.slab_params['void_radius']
-        h_rect = self.slab_params['void_rect_height']
-        n_voids = self.slab_params['n_voids']
-
-        # Момент инерции одной составной пустоты:
-        # 1. Полукруг (верхний)
-        I_semicircle_top = (math.pi * r**4) / 8
-
-        # 2. Прямоугольник (центральная часть)
-        I_rect = (2 * r * h_rect**3) / 12
-
-        # 3. Полукруг (нижний)
-        I_semicircle_bottom = (math.pi * r**4) / 8
-
-        # Суммарный момент инерции одной пустоты
-        I_one_void = I_semicircle_top + I_rect + I_semicircle_bottom
-
-        # Общий момент инерции всех пустот
-        total_I_void = n_voids * I_one_void
-
-        # Момент инерции бетонного сечения
-        I_concrete = I_solid - total_I_void
-
-        # Учет усиления углеволокном
-        if carbon_area > 0 and carbon_thickness > 0:
-            d = (self.slab_params['height'] + carbon_thickness) / 2
-            n = self.slab_params['E_carbon'] / self.slab_params['E_concrete']
-            I_total = I_concrete + n * carbon_area * d**2
-            return I_total
-
-        return I_concrete
+    def create_tab4_content(self, parent):
+        """Создает вкладку сочетаний нагрузок: все сочетания считаются
+        по откликам на единичные нагрузки без повторного интегрирования"""
+        L = self.slab_params['span_length']
+        q = self.slab_params['q_load']
+        self.load_cases = [
+            ("Расчетная нагрузка", q, []),
+            ("Монтажная", 0.5 * q, [(L / 2, 5000.0)]),
+        ]
 
-    def calculate_deflection(self, width_mm, thickness_mm, length_percent):
+        # 1. Параметры усиления и схема опирания
+        design_frame = ttk.LabelFrame(parent, text="Усиление и схема опирания")
+        design_frame.pack(fill="x", padx=5, pady=5)
+
+        ttk.Label(design_frame, text="Толщина усиления (мм):").pack(side="left", padx=5)
+        self.thickness_var_cases = tk.StringVar(value=str(self.thickness_options[1]))
+        thickness_combobox = ttk.Combobox(
+            design_frame, textvariable=self.thickness_var_cases,
+            values=self.thickness_options, state="readonly", width=6)
+        thickness_combobox.pack(side="left", padx=5)
+        thickness_combobox.bind("<<ComboboxSelected>>", self.update_load_cases)
+
+        ttk.Label(design_frame, text="Схема опирания:").pack(side="left", padx=5)
+        self.support_scheme_var_cases = tk.StringVar(value=next(iter(self.support_schemes)))
+        scheme_combobox = ttk.Combobox(
+            design_frame, textvariable=self.support_scheme_var_cases,
+            values=list(self.support_schemes), state="readonly", width=24)
+        scheme_combobox.pack(side="left", padx=5)
+        scheme_combobox.bind("<<ComboboxSelected>>", self.update_load_cases)
+
+        # 2. Ввод сочетания
+        input_frame = ttk.LabelFrame(parent, text="Сочетание нагрузок")
+        input_frame.pack(fill="x", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Название:").pack(side="left", padx=5)
+        self.case_name_var = tk.StringVar(value="Новое сочетание")
+        ttk.Entry(input_frame, textvariable=self.case_name_var, width=20).pack(side="left", padx=5)
+
+        ttk.Label(input_frame, text="q (Н/м):").pack(side="left", padx=5)
+        self.case_q_var = tk.StringVar(value=str(q))
+        ttk.Entry(input_frame, textvariable=self.case_q_var, width=10).pack(side="left", padx=5)
+
+        ttk.Label(input_frame, text="Силы x:P (м:Н; ...):").pack(side="left", padx=5)
+        self.case_points_var = tk.StringVar()
+        ttk.Entry(input_frame, textvariable=self.case_points_var, width=24).pack(side="left", padx=5)
+
+        ttk.Button(input_frame, text="Добавить", command=self.add_load_case).pack(side="left", padx=5)
+        ttk.Button(input_frame, text="Удалить", command=self.remove_load_case).pack(side="left", padx=5)
+
+        # 3. Таблица сочетаний с результатами
+        columns = ("name", "q", "points", "deflection", "moment", "shear")
+        self.cases_tree = ttk.Treeview(parent, columns=columns, show="headings", height=5)
+        headings = ["Сочетание", "q, Н/м", "Силы (x: P)", "fmax, мм", "|M|max, Н·м", "|Q|max, Н"]
+        for col, heading in zip(columns, headings):
+            self.cases_tree.heading(col, text=heading)
+            self.cases_tree.column(col, width=130, anchor="center")
+        self.cases_tree.pack(fill="x", padx=5, pady=5)
+
+        # 4. Прогибы всех сочетаний на одном графике
+        self.figure_cases = Figure(figsize=(10, 4), dpi=100)
+        self.cases_plot = self.figure_cases.add_subplot(111)
+        self.canvas_cases = FigureCanvasTkAgg(self.figure_cases, master=parent)
+        self.canvas_cases.get_tk_widget().pack(fill="both", expand=True, padx=5, pady=5)
+
+        self.update_load_cases()
+
+    @staticmethod
+    def _parse_point_loads(text):
+        """Разбор сосредоточенных сил из строки вида 4.7:5000; 2:1000"""
+        loads = []
+        for item in text.replace(",", ".").split(";"):
+            if item.strip():
+                x, P = item.split(":")
+                loads.append((float(x), float(P)))
+        return loads
+
+    @staticmethod
+    def _parse_patch_loads(text):
+        """Разбор нагрузок на участках из строки вида 1-3:4000; 5-6.5:2000"""
+        loads = []
+        for item in text.replace(",", ".").split(";"):
+            if item.strip():
+                span, q = item.split(":")
+                x0, x1 = span.split("-")
+                loads.append((float(x0), float(x1), float(q)))
+        return loads
+
+    def load_load_table(self):
+        """Загрузка табличной нагрузки q(x) из CSV (столбцы x, м и q, Н/м)"""
+        filename = filedialog.askopenfilename(
+            title="Таблица нагрузки q(x)",
+            filetypes=[("CSV", "*.csv"), ("Текст", "*.txt"), ("Все файлы", "*.*")])
+        if not filename:
+            return
         try:
-            width = width_mm / 1000
-            thickness = thickness_mm / 1000
-            L_lenta = (length_percent / 100) * self.slab_params['span_length']
+            with open(filename, encoding="utf-8-sig") as f:
+                rows = core.parse_load_table(f)
+            self.epure_load_table = tuple(rows)
+            self.load_table_label.config(text=f"таблица: {len(rows)} точек")
+            self.update_epures()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить таблицу нагрузки: {str(e)}")
 
-            carbon_area = width * thickness if thickness_mm > 0 else 0
-            I = self.calculate_inertia(carbon_area, thickness)
+    def clear_load_table(self):
+        self.epure_load_table = ()
+        self.load_table_label.config(text="таблица не загружена")
+        self.update_epures()
 
-            def integrand(x):
-                M = (self.slab_params['q_load'] * self.slab_params['span_length'] * x / 2) - \
-                    (self.slab_params['q_load'] * x**2 / 2)
-                M_bar = x / 2 if x <= self.slab_params['span_length'] / 2 else \
-                       (self.slab_params['span_length'] - x) / 2
-                return M * M_bar / (self.slab_params['E_concrete'] * I)
+    def epure_loads(self):
+        """Нагрузки для эпюр из полей ввода вкладки"""
+        try:
+            return core.Loads(
+                uniform=float(self.epure_q_var.get().replace(",", ".")),
+                point=tuple(self._parse_point_loads(self.epure_points_var.get())),
+                patch=tuple(self._parse_patch_loads(self.epure_patches_var.get())),
+                table=self.epure_load_table)
+        except ValueError:
+            raise ValueError("нагрузки задаются числом q, силами x:P и участками x0-x1:q")
+
+    def add_load_case(self):
+        """Добавление сочетания из полей ввода"""
+        try:
+            name = self.case_name_var.get().strip() or f"Сочетание {len(self.load_cases) + 1}"
+            q = float(self.case_q_var.get().replace(",", "."))
+            point_loads = self._parse_point_loads(self.case_points_var.get())
+        except ValueError:
+            messagebox.showerror(
+                "Ошибка ввода", "Введите q числом, а силы - в виде x:P; x:P")
+            return
+        self.load_cases.append((name, q, point_loads))
+        self.update_load_cases()
+
+    def remove_load_case(self):
+        """Удаление выбранных сочетаний"""
+        selected = {self.cases_tree.index(item) for item in self.cases_tree.selection()}
+        self.load_cases = [case for i, case in enumerate(self.load_cases) if i not in selected]
+        self.update_load_cases()
+
+    def influence_model(self, slab, reinforcement, scheme):
+        """Отклики на единичные нагрузки для усиления и схемы опирания (с кэшем)"""
+        return self.influence_cache.get((slab, reinforcement, scheme), lambda: fem.InfluenceModel(
+            slab, *self._scheme_segments(slab, reinforcement, scheme)))
+
+    def update_load_cases(self, event=None):
+        """Расчет всех сочетаний одним произведением матрицы на векторы
+
+        Пересчет выполняется, только если вкладка сочетаний видна и ее входные
+        данные изменились; матрицы влияния строятся в фоновом потоке.
+        """
+        if self.notebook.select() != str(self.tab4):
+            return
+        try:
+            slab = self.slab
+            reinforcement = self.reinforcement(
+                self.current_width, int(self.thickness_var_cases.get()), self.current_length)
+            scheme = self.support_scheme_var_cases.get()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка расчета сочетаний: {str(e)}")
+            return
+        load_cases = list(self.load_cases)
+        key = (slab, reinforcement, scheme,
+               tuple((name, q, tuple(point_loads)) for name, q, point_loads in load_cases))
+        if key == self._load_cases_key:
+            return
 
-            if length_percent >= 100:
-                result, _ = quad(integrand, 0, self.slab_params['span_length'])
-                return result * 1000
+        def compute():
+            model = self.influence_model(slab, reinforcement, scheme)
+            cases = [(q, point_loads) for _, q, point_loads in load_cases]
+            return model, model.evaluate_cases(cases) if cases else None
 
-            a = (self.slab_params['span_length'] - L_lenta) / 2
-            b = self.slab_params['span_length'] - a
+        self._submit_job(
+            "load_cases",
+            lambda result: self._show_load_cases(key, load_cases, *result), compute)
 
-            I_unreinforced = self.calculate_inertia(0, 0)
+    def _show_load_cases(self, key, load_cases, model, results):
+        """Таблица и график прогибов сочетаний (поток Tk)"""
+        try:
+            self._load_cases_key = key
+            reinforcement = key[1]
+            self.cases_tree.delete(*self.cases_tree.get_children())
+            ax = self.cases_plot
+            ax.clear()
+            for i, (name, q, point_loads) in enumerate(load_cases):
+                deflection = results['deflection'][:, i]
+                points = "; ".join(f"{x:g}: {P:g}" for x, P in point_loads) or "-"
+                self.cases_tree.insert("", "end", values=(
+                    name, f"{q:g}", points,
+                    f"{deflection.max():.2f}",
+                    f"{np.abs(results['moment'][:, i]).max():.0f}",
+                    f"{np.abs(results['shear'][:, i]).max():.0f}"))
+                ax.plot(model.x, deflection, linewidth=2, label=name)
+
+            for xs in model.support_x:
+                ax.axvline(xs, color='k', linestyle=':', linewidth=0.8)
+            ax.set_title(f"Прогибы по сочетаниям (ширина {reinforcement.width_mm:g} мм, "
+                         f"длина усиления {reinforcement.length_percent:g}%)")
+            ax.set_xlabel("Длина, м")
+            ax.set_ylabel("Прогиб, мм")
+            ax.invert_yaxis()
+            ax.grid(True)
+            if load_cases:
+                ax.legend()
+            self.figure_cases.tight_layout()
+            self.canvas_cases.draw_idle()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка расчета сочетаний: {str(e)}")
 
-            def integrand_unreinforced(x):
-                M = (self.slab_params['q_load'] * self.slab_params['span_length'] * x / 2) - \
-                    (self.slab_params['q_load'] * x**2 / 2)
-                M_bar = x / 2 if x <= self.slab_params['span_length'] / 2 else \
-                       (self.slab_params['span_length'] - x) / 2
-                return M * M_bar / \
-                    (self.slab_params['E_concrete'] * I_unreinforced)
+    @property
+    def slab(self):
+        """Неизменяемый снимок slab_params для расчетного ядра"""
+        return core.SlabParams.from_dict(self.slab_params)
 
-            part1, _ = quad(integrand_unreinforced, 0, a)
-            part2, _ = quad(integrand, a, b)
-            part3, _ = quad(integrand_unreinforced, b,
-                            self.slab_params['span_length'])
+    def reinforcement(self, width_mm, thickness_mm, length_percent):
+        """Усиление с текущим количеством лент"""
+        return core.Reinforcement(width_mm, thickness_mm, length_percent, self.current_tape_count)
 
-            return (part1 + part2 + part3) * 1000
+    def calculate_deflection(self, width_mm, thickness_mm, length_percent, method=None):
+        """Прогиб в середине пролета (мм) по интегралу Мора
 
+        method: "analytic" (по умолчанию) или "reference" (scipy quad).
+        """
+        try:
+            reinforcement = self.reinforcement(width_mm, thickness_mm, length_percent)
+            return self.design_cache.deflection(
+                self.slab, reinforcement, method or self.deflection_method)
         except Exception as e:
             raise RuntimeError(f"Ошибка расчета: {str(e)}")
 
     def calculate_moment(self, x, L, q):
         """Расчет изгибающего момента в сечении x"""
-        return (q * L * x / 2) - (q * x**2 / 2)
+        return core.calculate_moment(x, L, q)
 
     def calculate_shear_force(self, x, L, q):
         """Расчет поперечной силы в сечении x"""
-        return (q * L / 2) - (q * x)
+        return core.calculate_shear_force(x, L, q)
 
     def calculate_deflection_curve(
-        self, width_mm, thickness_mm, length_percent, n_points=50):
-        """Расчет кривой прогиба"""
+        self, width_mm, thickness_mm, length_percent, n_points=500):
+        """Расчет кривой прогиба сразу во всех точках"""
         try:
-            width = width_mm / 1000
-            thickness = thickness_mm / 1000
-            L_lenta = (length_percent / 100) * self.slab_params['span_length']
+            reinforcement = self.reinforcement(width_mm, thickness_mm, length_percent)
+            return core.calculate_deflection_curve(self.slab, reinforcement, n_points)
+        except Exception as e:
+            raise RuntimeError(f"Ошибка расчета кривой прогиба: {str(e)}")
 
-            carbon_area = width * thickness if thickness_mm > 0 else 0
-            I = self.calculate_inertia(carbon_area, thickness)
+    def calculate_load_response(
+        self, width_mm, thickness_mm, length_percent, loads, n_points=1000):
+        """Эпюры Q, M и прогиб шарнирно опертой балки от произвольных нагрузок"""
+        try:
+            reinforcement = self.reinforcement(width_mm, thickness_mm, length_percent)
+            return core.calculate_load_response(self.slab, reinforcement, loads, n_points)
+        except Exception as e:
+            raise RuntimeError(f"Ошибка расчета эпюр от нагрузок: {str(e)}")
+
+    def _scheme_segments(self, slab, reinforcement, scheme):
+        """Участки жесткости, опоры и пролеты для схемы опирания
+        (зона усиления по центру каждого пролета)"""
+        supports, n_spans = self.support_schemes[scheme]
+        L = slab.span_length
+        segments = [(x0 + i * L, x1 + i * L, EI)
+                    for i in range(n_spans)
+                    for x0, x1, EI in core.reinforcement_segments(slab, reinforcement)]
+        return segments, supports, [L] * n_spans
+
+    def calculate_beam_solution(
+        self, width_mm, thickness_mm, length_percent, scheme, elements_per_span=None,
+        loads=None):
+        """Расчет балки методом конечных элементов для схемы опирания
+        (зона усиления по центру каждого пролета)"""
+        try:
+            slab = self.slab
+            reinforcement = self.reinforcement(width_mm, thickness_mm, length_percent)
+            return fem.solve_beam(
+                slab, *self._scheme_segments(slab, reinforcement, scheme),
+                elements_per_span=elements_per_span or self.EPURE_POINTS, loads=loads)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Ошибка расчета методом конечных элементов: {str(e)}")
+
+    def toggle_catalogue(self):
+        """Переключение таблицы между текущим вариантом и всем каталогом"""
+        self.catalogue_mode = not self.catalogue_mode
+        if self.catalogue_mode:
+            catalogue = core.design_catalogue(
+                self.slab, widths_mm=np.arange(50, 301, 10),
+                max_layers=round(self.thickness_options[-1] / core.LAYER_THICKNESS_MM),
+                lengths_percent=np.arange(0, 101, 2), tape_counts=self.tape_count_options)
+            self.tree.set_results(catalogue, self.catalogue_columns)
+            self.catalogue_button.config(text="Показать текущий вариант")
+        else:
+            self.tree.set_results(self.results, self.result_columns)
+            self.catalogue_button.config(text="Показать весь каталог вариантов")
+
+    def optimize(self):
+        """Подбор усиления минимальной площади (стоимости) по заданной цели"""
+        try:
+            value = float(self.optimize_value_var.get().replace(",", "."))
+            target = self.optimize_target_var.get()
+            kwargs = {'target_reduction': value} if target == self.optimize_targets[0] else {
+                'target_deflection': value if target == self.optimize_targets[1]
+                else core.deflection_limit(self.slab, value)}
+            # Толщины - строки таблицы, чтобы выбранный вариант можно было применить
+            designs = core.optimize_design(
+                self.slab, widths_mm=self.width_options,
+                thicknesses_mm=[t for t in self.thickness_options if t > 0],
+                lengths_percent=[l for l in self.length_options if l > 0],
+                tape_counts=self.tape_count_options,
+                objective=self.optimize_objectives[self.optimize_objective_var.get()],
+                material_cost=self.material_cost, labor_cost=self.labor_cost, **kwargs)
+        except ValueError:
+            messagebox.showerror("Ошибка ввода", "Введите числовое значение цели")
+            return
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка подбора усиления: {str(e)}")
+            return
 
-            L = self.slab_params['span_length']
-            q = self.slab_params['q_load']
-            E = self.slab_params['E_concrete']
+        if not designs:
+            messagebox.showinfo("Подбор усиления", "Цель недостижима в заданных диапазонах")
+            return
+        self._show_optimization(designs)
+
+    def _show_optimization(self, designs):
+        """Окно с оптимальным и следующими за ним вариантами"""
+        window = tk.Toplevel(self.root)
+        window.title("Подбор усиления")
+
+        columns = ("width", "length", "tapes", "thickness", "layers", "deflection",
+                   "reduction", "area", "cost")
+        headings = ["Ширина (мм)", "Длина (%)", "Лент", "Толщина (мм)", "Слоёв", "Прогиб (мм)",
+                    "Снижение (%)", "Площадь (м²)", "Стоимость (руб.)"]
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=len(designs))
+        for col, heading in zip(columns, headings):
+            tree.heading(col, text=heading)
+            tree.column(col, width=100, anchor="center")
+        for d in designs:
+            tree.insert("", "end", values=(
+                f"{d['width_mm']:g}", f"{d['length_percent']:g}", d['tape_count'],
+                f"{d['thickness_mm']:g}", d['layers'],
+                f"{d['deflection']:.2f}", f"{d['reduction']:.2f}",
+                f"{d['area']:.4f}", f"{d['cost']:.0f}"))
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+        tree.selection_set(tree.get_children()[0])
+
+        def apply():
+            d = designs[tree.index(tree.selection()[0])]
+            if d['width_mm']:
+                self.width_var.set(str(int(d['width_mm'])))
+                self.length_var.set(str(int(d['length_percent'])))
+                self.tape_count_var.set(str(d['tape_count']))
+                self.calculate(select_thickness=int(d['thickness_mm']))
+            window.destroy()
+
+        ttk.Button(window, text="Применить выбранный вариант", command=apply).pack(pady=5)
+
+    def run_reliability(self):
+        """Расчет вероятности превышения предельного прогиба для всех толщин
+        текущего варианта в фоновом потоке"""
+        try:
+            ratio = float(self.reliability_ratio_var.get().replace(",", "."))
+        except ValueError:
+            messagebox.showerror("Ошибка ввода", "Введите знаменатель предельного прогиба L/…")
+            return
 
-            # Точки для расчета прогиба
-            x_points = np.linspace(0, L, n_points)
-            deflections = []
+        slab = self.slab
+        width, length = self.current_width, self.current_length
+        tape_count = self.current_tape_count
+        thicknesses = self.thickness_options
+        distributions = dict(self.reliability_distributions)
+        reinforcements = [self.reinforcement(width, t, length) for t in thicknesses]
+
+        def compute():
+            # Одни и те же выборки (seed) для всех толщин - сравнение без шума
+            return [core.monte_carlo_deflection(
+                        slab, reinforcement, distributions,
+                        self.RELIABILITY_SAMPLES, limit=core.deflection_limit(slab, ratio), seed=0)
+                    for reinforcement in reinforcements]
+
+        self._submit_job("reliability",
+                         lambda results: self._show_reliability(
+                             width, length, tape_count, thicknesses, results),
+                         compute)
+
+    def _show_reliability(self, width, length, tape_count, thicknesses, results):
+        """Окно с процентилями прогиба и вероятностью превышения предела
+        (параметры варианта - те, для которых выполнялся расчет)"""
+        window = tk.Toplevel(self.root)
+        window.title(f"Надежность: ширина {width} мм, длина {length}%, лент {tape_count}")
+        ttk.Label(window, text=(
+            f"Предел {results[0]['limit']:.2f} мм, выборок {results[0]['n_samples']:,} "
+            f"на толщину").replace(",", " ")).pack(padx=5, pady=5)
+
+        columns = ("thickness", "mean", "p5", "p50", "p95", "exceed")
+        headings = ["Толщина (мм)", "Среднее (мм)", "5% (мм)", "50% (мм)", "95% (мм)",
+                    "P(f > предела)"]
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=len(results))
+        for col, heading in zip(columns, headings):
+            tree.heading(col, text=heading)
+            tree.column(col, width=110, anchor="center")
+        for t, r in zip(thicknesses, results):
+            p = r['percentiles']
+            tree.insert("", "end", values=(
+                t, f"{r['mean']:.2f}", f"{p[5]:.2f}", f"{p[50]:.2f}", f"{p[95]:.2f}",
+                f"{r['p_exceed']:.4f}"))
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def calculate(self, select_thickness=None):
+        """Запуск расчета всех толщин в фоновом потоке
+
+        select_thickness - толщина (мм), строка которой выделяется в таблице
+        и выбирается для эпюр после отображения результатов.
+        """
+        try:
+            self._build_deferred_tabs()
 
-            for x in x_points:
-                def integrand(xi):
-                    M = self.calculate_moment(xi, L, q)
-                    M_bar = xi * (L - x) / L if xi <= x else x * (L - xi) / L
-                    return M * M_bar / (E * I)
+            width = int(self.width_var.get())
+            length = int(self.length_var.get())
+            tape_count = int(self.tape_count_var.get())
+            self.current_width = width
+            self.current_length = length
+            self.current_tape_count = tape_count
 
-                if length_percent >= 100:
-                    deflection, _ = quad(integrand, 0, L)
-                else:
-                    a = (L - L_lenta) / 2
-                    b = L - a
-                    part1, _ = quad(integrand, 0, a)
-                    part2, _ = quad(integrand, a, b)
-                    part3, _ = quad(integrand, b, L)
-                    deflection = part1 + part2 + part3
+            self.width_slider_eff.set(width)
+            self.length_slider_eff.set(length)
 
-                deflections.append(deflection * 1000)  # в мм
+            thicknesses = [t for t in self.thickness_options if t > 0]
+            slab = self.slab
+            self._remember_design(slab, width, length, tape_count)
 
-            return x_points, np.array(deflections)
+            # Готовая поверхность результатов: мгновенный выбор по индексам
+            surface = self.current_surface()
+            if surface is not None:
+                results = surface.lookup(width, length, tape_count)
+                self._show_results(thicknesses, results, select_thickness)
+                self._store_results(slab, width, thicknesses, length, tape_count)
+                return
+
+            # Результаты, сохраненные в предыдущих сеансах
+            results = (self.store.load(slab, width, thicknesses, length, tape_count)
+                       if self.store else None)
+            if results is not None:
+                self._show_results(thicknesses, results, select_thickness)
+                return
+
+            # Иначе все толщины рассчитываются одним пакетным вызовом вне потока Tk
+            self._submit_job(
+                "calculate",
+                lambda results: self._show_results(thicknesses, results, select_thickness),
+                self._compute_and_store, slab, width, thicknesses, length, tape_count)
 
         except Exception as e:
-            raise RuntimeError(f"Ошибка расчета кривой прогиба: {str(e)}")
+            messagebox.showerror("Ошибка", f"Ошибка расчета: {str(e)}")
+
+    def _compute_and_store(self, slab, width, thicknesses, length, tape_count=1):
+        """Пакетный расчет с записью в хранилище (выполняется в фоновом потоке)"""
+        results = core.calculate_design_grid(
+            slab, width, thicknesses, length, tape_count, grid=False)
+        if self.store:
+            self.store.save(slab, width, thicknesses, length, results, tape_count)
+        return results
+
+    def _store_results(self, slab, width, thicknesses, length, tape_count=1):
+        """Отложенная запись результатов в хранилище (в фоновом потоке)
+
+        Значения поверхности хранятся в float32, поэтому в хранилище
+        записывается точный пакетный расчет, если его там еще нет.
+        """
+        def save():
+            if self.store.load(slab, width, thicknesses, length, tape_count) is None:
+                self._compute_and_store(slab, width, thicknesses, length, tape_count)
+
+        if self.store:
+            self._executor.submit(save)
+
+    def _remember_design(self, slab, width, length, tape_count=1):
+        if self.store:
+            self._executor.submit(self.store.set_meta, "last_design", {
+                'slab': slab.as_dict(), 'width': width, 'length': length,
+                'tape_count': tape_count})
+
+    def restore_last_design(self):
+        """Повторное открытие проекта: последние параметры усиления и их
+        результаты из хранилища"""
+        if not self.store:
+            return
+        last = self.store.get_meta("last_design")
+        if not last or core.SlabParams.from_dict(last['slab']) != self.slab:
+            return
+        self.width_var.set(str(last['width']))
+        self.length_var.set(str(last['length']))
+        self.tape_count_var.set(str(last.get('tape_count', 1)))
+        self.calculate()
+
+    def precompute_surface(self):
+        """Фоновый расчет поверхности результатов для всей сетки вкладки
+        эффективности (ширины × толщины × длины × количество лент)"""
+        slab = self.slab
+        if self._surface_slab == slab:
+            return
+        self._surface_slab = slab
+        self._submit_job(
+            "surface", self._set_surface, core.DesignSurface,
+            slab, self.width_options, [t for t in self.thickness_options if t > 0],
+            self.length_options, self.tape_count_options)
+
+    def _set_surface(self, surface):
+        self.surface = surface
+        self.base_deflection = surface.base_deflection
+        self.update_info()
 
-    def calculate(self):
+    def current_surface(self):
+        """Поверхность результатов, если она соответствует текущим slab_params;
+        при изменении параметров плиты запускается ее пересчет"""
+        if self.surface is not None and self.surface.slab == self.slab:
+            return self.surface
+        self.precompute_surface()
+        return None
+
+    def _show_results(self, thicknesses, results, select_thickness=None):
+        """Заполнение таблицы и графиков результатами расчета (поток Tk)"""
         try:
-            self.tree.delete(*self.tree.get_children())
-            self.graph_data = []
-            
-            width = int(self.width_var.get())
-            length = int(self.length_var.get())
-            self.current_width = width
-            self.current_length = length
-            
-            self.width_slider_eff.set(width)
-            self.length_slider_eff.set(length)
-            
-            base_deflection = self.calculate_deflection(0, 0, 0)
-            
-            for thickness in self.thickness_options:
-                try:
-                    if thickness == 0:
-                        continue
-                        
-                    deflection = self.calculate_deflection(width, thickness, length)
-                    reduction = ((base_deflection - deflection) / base_deflection * 100) if base_deflection != 0 else 0
-                    layers = ceil(thickness / 0.4)
-                    L_lenta = (length / 100) * self.slab_params['span_length']
-                    area_per_layer = (width/1000) * L_lenta
-                    total_area = area_per_layer * layers
-                    
-                    efficiency = reduction / total_area if total_area > 0 else 0
-                    
-                    self.tree.insert("", "end", values=(
-                        thickness,
-                        f"{deflection:.2f}",
-                        f"{reduction:.1f}" if reduction > 0 else "0.0",
-                        layers,
-                        f"{total_area:.4f}",
-                        f"{efficiency:.4f}" if efficiency > 0 else "-"
-                    ))
-                    
-                    self.graph_data.append({
-                        'thickness': thickness,
-                        'deflection': deflection,
-                        'reduction': reduction,
-                        'efficiency': efficiency
-                    })
-                    
-                except Exception as e:
-                    messagebox.showwarning("Ошибка", f"Для толщины {thickness} мм: {str(e)}")
-            
+            self.results = core.DesignResults.from_grid(
+                results, self.current_width, thicknesses, self.current_length,
+                self.current_tape_count)
+            if not self.catalogue_mode:
+                self.tree.set_results(self.results)
+
             self.update_info()
             self.update_deflection_graph()
             self.update_efficiency_graph()
-            
-            # Строка 698:
-            self.thickness_combobox_epure['values'] = [d['thickness'] for d in self.graph_data]
-            if self.graph_data:
-                self.thickness_var_epure.set(self.graph_data[0]['thickness'])
-            
+            if hasattr(self, 'cases_tree'):
+                self.update_load_cases()
+
+            self.thickness_combobox_epure['values'] = thicknesses
+            if select_thickness in thicknesses:
+                self.thickness_var_epure.set(select_thickness)
+                if not self.catalogue_mode:
+                    self.tree.select_index(thicknesses.index(select_thickness))
+            elif len(self.results):
+                self.thickness_var_epure.set(thicknesses[0])
+
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка расчета: {str(e)}")
-    
+            messagebox.showerror("Ошибка", f"Ошибка отображения результатов: {str(e)}")
+
+    def _submit_job(self, kind, callback, func, *args, **kwargs):
+        """Запуск func в фоновом потоке; callback(result) вызывается в потоке Tk
+
+        Новое задание того же вида (kind) вытесняет еще не завершенное:
+        ожидающее отменяется, а результат уже запущенного отбрасывается.
+        """
+        self._job_ids[kind] = job_id = self._job_ids.get(kind, 0) + 1
+        pending = self._pending_jobs.get(kind)
+        if pending is not None:
+            pending.cancel()
+
+        def run():
+            try:
+                self._job_results.put((kind, job_id, callback, func(*args, **kwargs), None))
+            except Exception as e:
+                self._job_results.put((kind, job_id, callback, None, e))
+
+        self._pending_jobs[kind] = self._executor.submit(run)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.JOB_POLL_MS, self._poll_jobs)
+
+    def _poll_jobs(self):
+        """Опрос очереди результатов фоновых заданий через root.after
+
+        Ошибка в обработчике результата не останавливает опрос: иначе
+        результаты следующих заданий никогда не были бы показаны.
+        """
+        try:
+            latest = {}
+            while True:
+                try:
+                    kind, job_id, callback, result, error = self._job_results.get_nowait()
+                except queue.Empty:
+                    break
+                # Результаты устаревших заданий не отображаются
+                if job_id == self._job_ids.get(kind):
+                    latest[kind] = (callback, result, error)
+                    self._pending_jobs.pop(kind, None)
+
+            for kind, (callback, result, error) in latest.items():
+                if error is not None:
+                    messagebox.showerror("Ошибка", f"Ошибка расчета: {str(error)}")
+                    continue
+                try:
+                    callback(result)
+                except Exception as e:
+                    messagebox.showerror("Ошибка", f"Ошибка отображения результатов: {str(e)}")
+        finally:
+            if self._pending_jobs:
+                self.root.after(self.JOB_POLL_MS, self._poll_jobs)
+            else:
+                self._polling = False
+
+    def _init_deflection_artists(self):
+        """Однократное создание элементов графика прогиба; при обновлении
+        меняются только данные линий и подписи"""
+        ax = self.deflection_plot
+        self.base_deflection_line = ax.axhline(
+            y=0, color='r', linestyle='--', label='Без усиления')
+        self.deflection_line, = ax.plot([], [], 'b-o', label='С усилением')
+        ax.set_title("Зависимость прогиба от толщины")
+        ax.set_xlabel("Толщина ленты (мм)")
+        ax.set_ylabel("Прогиб (мм)")
+        ax.grid(True)
+        self.deflection_legend = ax.legend()
+        self.figure_deflection.tight_layout()
+
+    @staticmethod
+    def _autoscale_if_needed(ax, x, y):
+        """Пересчет пределов осей, только если данные вышли за текущие
+        пределы или занимают меньше половины области"""
+        if len(x) == 0:
+            return
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        y_min, y_max = np.min(y), np.max(y)
+        inside = x0 <= np.min(x) and np.max(x) <= x1 and y0 <= y_min and y_max <= y1
+        if inside and (y_max - y_min) >= 0.5 * (y1 - y0):
+            return
+        ax.relim()
+        ax.autoscale_view()
+
     def update_deflection_graph(self):
-        if not self.graph_data:
+        if not len(self.results):
             return
 
         try:
-            thicknesses = [d['thickness'] for d in self.graph_data]
-            deflections = [d['deflection'] for d in self.graph_data]
-
-            self.deflection_plot.clear()
+            thicknesses = self.results.thickness_mm
+            deflections = self.results.deflection
 
-            # Добавляем горизонтальную линию для базового прогиба
-            self.deflection_plot.axhline(y=self.base_deflection, color='r', linestyle='--',
-                                       label=f'Без усиления: {self.base_deflection:.2f} мм')
+            # Горизонтальная линия базового прогиба и график прогиба
+            label = f'Без усиления: {self.base_deflection:.2f} мм'
+            self.base_deflection_line.set_ydata([self.base_deflection] * 2)
+            self.base_deflection_line.set_label(label)
+            self.deflection_legend.get_texts()[0].set_text(label)
+            self.deflection_line.set_data(thicknesses, deflections)
 
-            # График прогиба
-            self.deflection_plot.plot(
-    thicknesses, deflections, 'b-o', label='С усилением')
             self.deflection_plot.set_title(
                 f"Зависимость прогиба от толщины (ширина: {self.current_width}мм, длина: {self.current_length}%)")
-            self.deflection_plot.set_xlabel("Толщина ленты (мм)")
-            self.deflection_plot.set_ylabel("Прогиб (мм)")
-            self.deflection_plot.legend()
-            self.deflection_plot.grid(True)
+            self._autoscale_if_needed(
+                self.deflection_plot, thicknesses, np.append(deflections, self.base_deflection))
 
-            self.figure_deflection.tight_layout()
-            self.canvas_deflection.draw()
+            self.canvas_deflection.draw_idle()
 
         except Exception as e:
             messagebox.showerror(
     "Ошибка", f"Ошибка обновления графика прогиба: {str(e)}")
 
-    def update_efficiency_graph(self):
-        if not self.graph_data:
-            return
+    def _schedule_coalesced(self, key, callback):
+        """Объединение серии событий в один вызов callback за кадр"""
+        if key not in self._coalesced:
+            self._coalesced[key] = self.root.after(
+                self.FRAME_MS, self._run_coalesced, key, callback)
+
+    def _run_coalesced(self, key, callback):
+        self._coalesced.pop(key, None)
+        callback()
+
+    @staticmethod
+    def _snap(value, options):
+        """Ближайшее значение из дискретного набора"""
+        return min(options, key=lambda option: abs(option - value))
 
+    def _on_efficiency_slider(self, value=None):
+        """Движение ползунков вкладки эффективности (не чаще раза за кадр)"""
+        self._schedule_coalesced("efficiency_sliders", self._apply_efficiency_sliders)
+
+    def _apply_efficiency_sliders(self):
+        """Привязка ползунков к сетке значений и пересчет при их изменении"""
         try:
-            width = int(float(self.width_slider_eff.get()))
-            length = int(float(self.length_slider_eff.get()))
-
-            if width != self.current_width or length != self.current_length:
-                self.current_width = width
-                self.current_length = length
-                self.width_var.set(str(width))
-                self.length_var.set(str(length))
-                self.calculate()
+            width = self._snap(float(self.width_slider_eff.get()), self.width_options)
+            length = self._snap(float(self.length_slider_eff.get()), self.length_options)
+
+            # Ползунки "прилипают" к допустимым значениям
+            if float(self.width_slider_eff.get()) != width:
+                self.width_slider_eff.set(width)
+            if float(self.length_slider_eff.get()) != length:
+                self.length_slider_eff.set(length)
+
+            if not len(self.results):
                 return
+            if width == self.current_width and length == self.current_length:
+                return
+
+            self.width_var.set(str(width))
+            self.length_var.set(str(length))
+            self.calculate()
+
+        except Exception as e:
+            messagebox.showerror(
+    "Ошибка", f"Ошибка обновления графика эффективности: {str(e)}")
+
+    def _init_efficiency_artists(self):
+        """Однократное создание элементов графика эффективности"""
+        ax = self.efficiency_plot
+        self.efficiency_line, = ax.plot([], [], 'g-o')
+        ax.set_title("Эффективность усиления")
+        ax.set_xlabel("Толщина ленты (мм)")
+        ax.set_ylabel("Эффективность (%/м²)")
+        ax.grid(True)
+        self.figure_efficiency.tight_layout()
+
+    def update_pareto_plot(self):
+        """Расчет каталога вариантов и отрисовка недоминируемых вариантов"""
+        try:
+            catalogue = core.design_catalogue(
+                self.slab, widths_mm=self.width_options,
+                max_layers=round(self.thickness_options[-1] / core.LAYER_THICKNESS_MM),
+                lengths_percent=self.length_options, tape_counts=self.tape_count_options)
+            front = core.pareto_front(catalogue.area, catalogue.deflection, catalogue.layers)
+            self.pareto_catalogue = catalogue
+            self.pareto_indices = front
+
+            ax = self.pareto_plot
+            ax.clear()
+            ax.scatter(catalogue.area, catalogue.reduction, s=3, c='lightgray',
+                       label=f"Все варианты ({len(catalogue)})")
+            points = ax.scatter(catalogue.area[front], catalogue.reduction[front],
+                                s=12, c=catalogue.layers[front], cmap='viridis',
+                                picker=True, pickradius=4,
+                                label=f"Фронт Парето ({len(front)})")
+            if not hasattr(self, 'pareto_colorbar'):
+                self.pareto_colorbar = self.figure_pareto.colorbar(points, ax=ax, label="Слоёв")
+            else:
+                self.pareto_colorbar.update_normal(points)
+            self.pareto_marker, = ax.plot([], [], 'ro', markersize=10, fillstyle='none')
+            ax.set_title("Площадь углепластика и снижение прогиба")
+            ax.set_xlabel("Площадь (м²)")
+            ax.set_ylabel("Снижение прогиба (%)")
+            ax.grid(True)
+            ax.legend(loc='lower right')
+            self.figure_pareto.tight_layout()
+            self.canvas_pareto.draw_idle()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка построения фронта Парето: {str(e)}")
+
+    def _on_pareto_pick(self, event):
+        """Показ параметров варианта, выбранного щелчком на фронте Парето"""
+        if self.pareto_catalogue is None or not len(event.ind):
+            return
+        c = self.pareto_catalogue
+        i = self.pareto_indices[event.ind[0]]
+        self.pareto_marker.set_data([c.area[i]], [c.reduction[i]])
+        self.pareto_info.config(text=(
+            f"Ширина {c.width_mm[i]:g} мм, слоёв {c.layers[i]} "
+            f"({c.thickness_mm[i]:.1f} мм), длина {c.length_percent[i]:g}%, "
+            f"лент {c.tape_count[i]}: прогиб {c.deflection[i]:.2f} мм, "
+            f"снижение {c.reduction[i]:.2f}%, площадь {c.area[i]:.3f} м²"))
+        self.canvas_pareto.draw_idle()
 
-            thicknesses = [d['thickness'] for d in self.graph_data]
-            efficiencies = [d['efficiency']
-                for d in self.graph_data if d['efficiency'] > 0]
-            eff_thicknesses = [d['thickness']
-                for d in self.graph_data if d['efficiency'] > 0]
+    def update_efficiency_graph(self):
+        if not len(self.results):
+            return
 
-            self.efficiency_plot.clear()
+        try:
+            width = self.current_width
+            length = self.current_length
 
-            if eff_thicknesses:
-                self.efficiency_plot.plot(eff_thicknesses, efficiencies, 'g-o')
-                self.efficiency_plot.set_title(
-                    f"Эффективность усиления (ширина: {width}мм, длина: {length}%)")
-                self.efficiency_plot.set_xlabel("Толщина ленты (мм)")
-                self.efficiency_plot.set_ylabel("Эффективность (%/м²)")
-                self.efficiency_plot.grid(True)
+            effective = self.results[self.results.efficiency > 0]
+            efficiencies = effective.efficiency
+            eff_thicknesses = effective.thickness_mm
 
-            self.figure_efficiency.tight_layout()
-            self.canvas_efficiency.draw()
+            self.efficiency_line.set_data(eff_thicknesses, efficiencies)
+            self.efficiency_plot.set_title(
+                f"Эффективность усиления (ширина: {width}мм, длина: {length}%)")
+            self._autoscale_if_needed(self.efficiency_plot, eff_thicknesses, efficiencies)
+
+            self.canvas_efficiency.draw_idle()
 
         except Exception as e:
             messagebox.showerror(
@@ -623,7 +1376,7 @@ class BeamCalculatorApp:
     def update_epures(self, event=None):
         """Обновляет все эпюры с обработкой ошибок"""
         try:
-            if not self.graph_data:
+            if not len(self.results):
                 messagebox.showwarning(
         "Предупреждение", "Сначала выполните расчет")
                 return
@@ -633,37 +1386,50 @@ class BeamCalculatorApp:
 
             L = self.slab_params['span_length']
             q = self.slab_params['q_load']
-            x = np.linspace(0, L, 100)
-
-            # Расчет моментов и сил
-            M = [self.calculate_moment(xi, L, q) for xi in x]
-            Q = [self.calculate_shear_force(xi, L, q) for xi in x]
-
-            # Расчет прогибов
-            x_def, deflection = self.calculate_deflection_curve(
-                self.current_width, thickness, self.current_length)
-
-            # Сглаживание кривой
-            if len(x_def) > 3:
-                spline = make_interp_spline(x_def, deflection, k=3)
-                x_smooth = np.linspace(0, L, 200)
-                deflection_smooth = spline(x_smooth)
+            scheme = self.support_scheme_var.get()
+            loads = self.epure_loads()
+            simply_supported = self.support_schemes[scheme] == (("pin", "pin"), 1)
+
+            if simply_supported and loads.is_uniform and loads.uniform == q:
+                x = np.linspace(0, L, self.EPURE_POINTS)
+
+                # Расчет моментов и сил сразу для всего массива точек
+                M = self.calculate_moment(x, L, q)
+                Q = self.calculate_shear_force(x, L, q)
+
+                # Расчет прогибов (точная кривая, сглаживание не требуется)
+                x_def, deflection = self.calculate_deflection_curve(
+                    self.current_width, thickness, self.current_length,
+                    n_points=self.EPURE_POINTS)
+            elif simply_supported:
+                # Произвольные нагрузки: накопленное интегрирование за O(n)
+                x, Q, M, deflection = self.calculate_load_response(
+                    self.current_width, thickness, self.current_length, loads,
+                    n_points=self.EPURE_POINTS)
+                x_def = x
             else:
-                x_smooth = x_def
-                deflection_smooth = deflection
+                solution = self.calculate_beam_solution(
+                    self.current_width, thickness, self.current_length, scheme,
+                    loads=loads)
+                x = x_def = solution.x
+                M, Q, deflection = solution.moment, solution.shear, solution.deflection
+
+            # Расчетный момент для эпюры напряжений - наибольший по модулю
+            self.epure_moment_max = np.abs(M).max()
 
             # Очистка графиков
+            # (схема сечения хранит свои элементы и обновляется сама)
             for plot in [self.epure_m_plot, self.epure_q_plot,
-                        self.epure_deflection_plot, self.epure_section_plot,
-                        self.epure_stress_plot]:
+                        self.epure_deflection_plot, self.epure_stress_plot]:
                 plot.clear()
 
             # Построение эпюр
             self._plot_moment_epure(x, M)
             self._plot_shear_epure(x, Q)
-            self._plot_deflection_epure(x_smooth, deflection_smooth)
+            self._plot_deflection_epure(x_def, deflection)
             self.draw_section_plot()
             self.draw_stress_plot(thickness)
+            self.draw_stress_map(thickness, x, M)
 
             self.figure_epure.tight_layout()
             self.canvas_epure.draw()
@@ -686,91 +1452,129 @@ class BeamCalculatorApp:
                 traceback.print_exc(file=f)
 
     def draw_section_plot(self):
-        """Улучшенное отображение сечения с динамическим масштабированием"""
+        """Схема сечения: статичная геометрия плиты строится один раз,
+        лента усиления - при изменении параметров, масштаб - пределами осей"""
         try:
             if not hasattr(self, 'epure_section_plot'):
                 return
-            
-            ax = self.epure_section_plot
-            ax.clear()
-            
-            # Параметры плиты
-            width = self.slab_params['width']
-            height = self.slab_params['height']
-            r = self.slab_params['void_radius']
-            h_rect = self.slab_params['void_rect_height']
-            n_voids = self.slab_params['n_voids']
-            
-            # Параметры усиления
-            carbon_width = self.current_width / 1000 if self.current_thickness > 0 else 0
-            carbon_thickness = self.current_thickness / 1000 if self.current_thickness > 0 else 0
-            
-            # 1. Рисуем ленту усиления (если есть)
-            if self.current_thickness > 0:
-                carbon_patch = plt.Rectangle(
-                    (width/2 - carbon_width/2, -carbon_thickness),
-                    carbon_width, carbon_thickness,
-                    fill=True, color='blue', alpha=0.5, linewidth=1
-                )
-                ax.add_patch(carbon_patch)
-                
-                # Компактная подпись с выноской
-                ax.annotate(
-                    f"{self.current_width}×{self.current_thickness} мм",
-                    xy=(width/2, -carbon_thickness/2),
-                    xytext=(width/2, -carbon_thickness*1.5),
-                    ha='center', va='top', fontsize=8,
-                    arrowprops=dict(arrowstyle="-", color='blue', linewidth=0.5),
-                    bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="none", alpha=0.7)
-                )
-            
-            # 2. Рисуем контур плиты
-            slab_patch = plt.Rectangle(
-                (0, -carbon_thickness), width, height + carbon_thickness,
-                fill=False, linewidth=2, edgecolor='black'
-            )
-            ax.add_patch(slab_patch)
-            
-            # 3. Рисуем пустоты
-            void_spacing = width / (n_voids + 1)
-            for i in range(n_voids):
-                x_center = void_spacing * (i + 1)
-                y_top = height/2 + h_rect/2 - carbon_thickness
-                y_bottom = height/2 - h_rect/2 - carbon_thickness
-                
-                # Верхний полукруг
-                ax.add_patch(patches.Wedge(
-                    (x_center, y_top), r, 0, 180,
-                    fill=False, color='red', linewidth=1
-                ))
-                # Центральный прямоугольник
-                ax.add_patch(plt.Rectangle(
-                    (x_center - r, y_bottom), 2*r, h_rect,
-                    fill=False, color='red', linewidth=1
-                ))
-                # Нижний полукруг
-                ax.add_patch(patches.Wedge(
-                    (x_center, y_bottom), r, 180, 360,
-                    fill=False, color='red', linewidth=1
-                ))
-            
-            # Настройка области просмотра
-            x_center = width / 2
-            y_center = (height - carbon_thickness) / 2
-            view_size = max(width, height + carbon_thickness) * self.section_zoom
-            padding = max(width, height) * 0.1 / self.section_zoom
-            
-            ax.set_xlim(x_center - view_size/2 - padding, x_center + view_size/2 + padding)
-            ax.set_ylim(y_center - view_size/2 - padding, y_center + view_size/2 + padding)
-            
-            ax.set_title(f"Схема сечения [Масштаб: {self.section_zoom:.1f}x] (+/-)")
-            ax.set_aspect('equal')
-            ax.grid(True, linestyle=':', alpha=0.7)
-            
+
+            self._update_section_geometry()
+            self._update_section_tape()
+            self._apply_section_zoom()
+
         except Exception as e:
             print(f"Ошибка при отрисовке сечения: {e}")
             messagebox.showerror("Ошибка", f"Ошибка при отрисовке сечения: {str(e)}")
-            
+
+    def _update_section_geometry(self):
+        """Контур плиты и пустоты одной коллекцией PatchCollection"""
+        from matplotlib import patches
+        from matplotlib.collections import PatchCollection
+
+        width = self.slab_params['width']
+        height = self.slab_params['height']
+        r = self.slab_params['void_radius']
+        h_rect = self.slab_params['void_rect_height']
+        n_voids = self.slab_params['n_voids']
+
+        key = (width, height, r, h_rect, n_voids)
+        if getattr(self, '_section_geometry_key', None) == key:
+            return
+
+        ax = self.epure_section_plot
+        ax.clear()
+        self._section_tape_key = None
+        self._section_tape_artists = []
+
+        # Контур плиты
+        section_patches = [patches.Rectangle(
+            (0, 0), width, height, fill=False, linewidth=2, edgecolor='black')]
+
+        # Пустоты: верхний полукруг, центральный прямоугольник, нижний полукруг
+        void_spacing = width / (n_voids + 1)
+        y_top = height/2 + h_rect/2
+        y_bottom = height/2 - h_rect/2
+        for i in range(n_voids):
+            x_center = void_spacing * (i + 1)
+            section_patches += [
+                patches.Wedge((x_center, y_top), r, 0, 180,
+                              fill=False, edgecolor='red', linewidth=1),
+                patches.Rectangle((x_center - r, y_bottom), 2*r, h_rect,
+                                  fill=False, edgecolor='red', linewidth=1),
+                patches.Wedge((x_center, y_bottom), r, 180, 360,
+                              fill=False, edgecolor='red', linewidth=1),
+            ]
+        ax.add_collection(PatchCollection(section_patches, match_original=True))
+
+        # Подписи осей не нужны для схемы, поэтому при масштабировании
+        # область схемы (с заголовком и рисками) не меняет размеров
+        ax.set_aspect('equal')
+        ax.grid(True, linestyle=':', alpha=0.7)
+        ax.tick_params(labelbottom=False, labelleft=False)
+        ax.set_title("Схема сечения (+/- масштаб)")
+        self._section_zoom_text = ax.text(
+            0.02, 0.97, "", transform=ax.transAxes, va='top', fontsize=8)
+
+        self._section_geometry_key = key
+
+    def _update_section_tape(self):
+        """Лента усиления и подпись пересоздаются только при их изменении"""
+        from matplotlib import patches
+
+        key = (self.current_width, self.current_thickness, self.current_tape_count)
+        if self._section_tape_key == key:
+            return
+
+        for artist in self._section_tape_artists:
+            artist.remove()
+        self._section_tape_artists = []
+        self._section_tape_key = key
+
+        if self.current_thickness <= 0:
+            return
+
+        ax = self.epure_section_plot
+        width = self.slab_params['width']
+        # Ленты наклеиваются рядом: на схеме - общей шириной
+        carbon_width = self.current_width * self.current_tape_count / 1000
+        carbon_thickness = self.current_thickness / 1000
+
+        carbon_patch = patches.Rectangle(
+            (width/2 - carbon_width/2, -carbon_thickness),
+            carbon_width, carbon_thickness,
+            fill=True, color='blue', alpha=0.5, linewidth=1
+        )
+        ax.add_patch(carbon_patch)
+
+        # Компактная подпись с выноской
+        label = ax.annotate(
+            (f"{self.current_tape_count}×" if self.current_tape_count > 1 else "")
+            + f"{self.current_width}×{self.current_thickness} мм",
+            xy=(width/2, -carbon_thickness/2),
+            xytext=(width/2, -carbon_thickness*1.5),
+            ha='center', va='top', fontsize=8,
+            arrowprops=dict(arrowstyle="-", color='blue', linewidth=0.5),
+            bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="none", alpha=0.7),
+            clip_on=True
+        )
+        self._section_tape_artists = [carbon_patch, label]
+
+    def _apply_section_zoom(self):
+        """Масштаб схемы сечения через пределы осей (квадратная область)"""
+        ax = self.epure_section_plot
+        width = self.slab_params['width']
+        height = self.slab_params['height']
+        carbon_thickness = self.current_thickness / 1000 if self.current_thickness > 0 else 0
+
+        x_center = width / 2
+        y_center = (height - carbon_thickness) / 2
+        view_size = max(width, height + carbon_thickness) / self.section_zoom
+        padding = max(width, height) * 0.1 / self.section_zoom
+
+        ax.set_xlim(x_center - view_size/2 - padding, x_center + view_size/2 + padding)
+        ax.set_ylim(y_center - view_size/2 - padding, y_center + view_size/2 + padding)
+        self._section_zoom_text.set_text(f"Масштаб: {self.section_zoom:.1f}x")
+
     def draw_stress_plot(self, thickness_mm):
         """Эпюра нормальных напряжений с учетом усиления"""
         try:
@@ -780,33 +1584,16 @@ class BeamCalculatorApp:
             height = self.slab_params['height']
             thickness = thickness_mm / 1000
             
-            # Расчет максимального момента
+            # Расчет максимального момента (по эпюре для выбранной схемы опирания)
             L = self.slab_params['span_length']
             q = self.slab_params['q_load']
-            M_max = q * L**2 / 8
-            
-            # Параметры усиления
-            carbon_width = self.current_width / 1000
-            carbon_thickness = thickness
-            carbon_area = carbon_width * carbon_thickness
-            
-            # Момент инерции составного сечения
-            I_total = self.calculate_inertia(carbon_area, carbon_thickness)
-            
-            # Коэффициент приведения
-            n = self.slab_params['E_carbon'] / self.slab_params['E_concrete']
-            
-            # Напряжения по высоте сечения
-            y_points = np.linspace(-carbon_thickness, height, 100)
-            stresses = []
-            
-            for y in y_points:
-                if y >= 0:  # Бетонная часть
-                    sigma = M_max * (y - (height - carbon_thickness)/2) / I_total
-                else:  # Углепластиковая часть
-                    sigma = n * M_max * (y - (height - carbon_thickness)/2) / I_total
-                stresses.append(sigma / 1e6)  # Переводим в МПа
+            M_max = getattr(self, 'epure_moment_max', q * L**2 / 8)
             
+            # Напряжения по высоте сечения (бетон и углепластик) одним вызовом
+            reinforcement = self.reinforcement(self.current_width, thickness_mm, 100)
+            y_points = np.linspace(-thickness, height, self.EPURE_POINTS)
+            stresses = core.calculate_stress(self.slab, reinforcement, M_max, y_points) / 1e6  # МПа
+
             # Рисуем эпюру
             line, = ax.plot(stresses, y_points, 'm-', linewidth=2, label='Эпюра напряжений')
             ax.fill_betweenx(y_points, stresses, 0, color='m', alpha=0.2)
@@ -815,7 +1602,7 @@ class BeamCalculatorApp:
             divider = ax.axhline(y=0, color='k', linestyle='--', linewidth=0.5)
             
             # Подписи
-            max_stress = max(abs(s) for s in stresses)
+            max_stress = np.abs(stresses).max()
             ax.annotate(f'σmax = {max_stress:.2f} МПа',
                        xy=(max_stress, height/2),
                        xytext=(max_stress*1.1, height*0.7),
@@ -834,9 +1621,74 @@ class BeamCalculatorApp:
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка построения эпюры напряжений: {str(e)}")
 
+    def draw_stress_map(self, thickness_mm, x_epure, M):
+        """Поле нормальных напряжений σ(x, y) по пролету в виде изображения
+        (по эпюре моментов M(x) выбранной схемы опирания и нагрузки)"""
+        try:
+            ax = self.epure_stress_map_plot
+            reinforcement = self.reinforcement(
+                self.current_width, thickness_mm, self.current_length)
+            x, y, sigma = core.calculate_stress_field(
+                self.slab, reinforcement, self.EPURE_POINTS, self.EPURE_POINTS // 2,
+                moment=(x_epure, M))
+            sigma_mpa = sigma / 1e6
+            self._stress_map = (x, y, sigma_mpa)
+
+            # Пики напряжений в бетоне и в углепластике по всему пролету
+            concrete = sigma_mpa[y >= 0]
+            carbon = sigma_mpa[y < 0]
+            peaks = f"бетон: {np.nanmin(concrete):.1f}…{np.nanmax(concrete):.1f} МПа"
+            if carbon.size and not np.all(np.isnan(carbon)):
+                peaks += f", углепластик: {np.nanmax(np.abs(carbon)):.1f} МПа"
+
+            limit = max(np.nanmax(np.abs(sigma_mpa)), 1e-9)
+            extent = (x[0], x[-1], y[0], y[-1])
+            if self._stress_map_image is None:
+                self._stress_map_image = ax.imshow(
+                    sigma_mpa, extent=extent, origin='lower', aspect='auto',
+                    cmap='RdBu_r', vmin=-limit, vmax=limit, interpolation='nearest')
+                self.figure_epure.colorbar(self._stress_map_image, ax=ax, label="σ, МПа")
+                ax.set_xlabel("Длина пролета, м")
+                ax.set_ylabel("Высота сечения, м")
+                self._stress_map_readout = ax.text(
+                    0.01, 0.97, "", transform=ax.transAxes, va='top', fontsize=8,
+                    bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="none", alpha=0.7),
+                    clip_on=True, animated=True)
+            else:
+                self._stress_map_image.set_data(sigma_mpa)
+                self._stress_map_image.set_extent(extent)
+                self._stress_map_image.set_clim(-limit, limit)
+            ax.set_title(f"Поле напряжений σ(x, y) ({peaks})", fontsize=9)
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка построения поля напряжений: {str(e)}")
+
+    def _on_stress_map_motion(self, event):
+        """Показ напряжения под курсором на поле напряжений"""
+        if self._stress_map_image is None or event.inaxes is not self.epure_stress_map_plot:
+            return
+        x, y, sigma_mpa = self._stress_map
+        i = int(np.clip(np.searchsorted(y, event.ydata), 0, len(y) - 1))
+        j = int(np.clip(np.searchsorted(x, event.xdata), 0, len(x) - 1))
+        value = sigma_mpa[i, j]
+        text = "нет материала" if np.isnan(value) else f"σ = {value:.2f} МПа"
+        readout = self._stress_map_readout
+        readout.set_text(f"x = {x[j]:.2f} м, y = {y[i]:.3f} м: {text}")
+        if self._stress_map_background is None:
+            return
+
+        # Только подпись поверх сохраненного фона; обновляется объединение
+        # прежней и новой рамок подписи, чтобы стереть более длинный текст
+        self.canvas_epure.restore_region(self._stress_map_background)
+        self.figure_epure.draw_artist(readout)
+        extent = readout.get_window_extent()
+        self.canvas_epure.blit(
+            Bbox.union([self._stress_map_readout_extent, extent]).padded(4))
+        self._stress_map_readout_extent = extent
+
     def _plot_moment_epure(self, x, M):
         """Отрисовка эпюры моментов"""
-        max_moment = max(M)
+        max_moment = M.max()
         max_moment_x = x[np.argmax(M)]
         self.epure_m_plot.plot(x, M, 'b-', linewidth=2)
         self.epure_m_plot.fill_between(x, M, color='b', alpha=0.2)
@@ -850,7 +1702,7 @@ class BeamCalculatorApp:
 
     def _plot_shear_epure(self, x, Q):
         """Отрисовка эпюры поперечных сил"""
-        max_shear = max(abs(q) for q in Q)
+        max_shear = np.abs(Q).max()
         max_shear_x = x[np.argmax(np.abs(Q))]
         self.epure_q_plot.plot(x, Q, 'r-', linewidth=2)
         self.epure_q_plot.fill_between(x, Q, color='r', alpha=0.2)
@@ -864,7 +1716,7 @@ class BeamCalculatorApp:
 
     def _plot_deflection_epure(self, x, deflection):
         """Отрисовка эпюры прогибов"""
-        max_deflection = max(deflection)
+        max_deflection = deflection.max()
         max_deflection_x = x[np.argmax(deflection)]
         self.epure_deflection_plot.plot(x, deflection, 'g-', linewidth=2)
         self.epure_deflection_plot.annotate(f'fmax = {max_deflection:.2f} мм',
@@ -876,6 +1728,23 @@ class BeamCalculatorApp:
         self.epure_deflection_plot.set_ylabel("Прогиб, мм")
         self.epure_deflection_plot.grid(True)
         
+    def _sensitivity_info(self):
+        """Приращения прогиба по точным производным для текущего варианта"""
+        thickness = self.current_thickness or self.LAYER_THICKNESS * 1000
+        g = core.deflection_sensitivities(
+            self.slab, self.current_width, thickness, self.current_length,
+            self.current_tape_count)
+        layer = self.LAYER_THICKNESS * 1000
+        return [
+            "",
+            f"Чувствительность прогиба (толщина {thickness:.1f} мм):",
+            f"+1 слой: {g['thickness_mm'] * layer:+.3f} мм",
+            f"+50 мм ширины: {g['width_mm'] * 50:+.3f} мм",
+            f"+5% длины усиления: {g['length_percent'] * 5:+.3f} мм",
+            f"+10% E углепластика: {g['E_carbon'] * 0.1 * self.slab_params['E_carbon']:+.3f} мм",
+            f"+10% нагрузки: {g['q_load'] * 0.1 * self.slab_params['q_load']:+.3f} мм",
+        ]
+
     def update_info(self):
         self.info_text.delete(1.0, tk.END)
         info = [
@@ -892,33 +1761,36 @@ class BeamCalculatorApp:
             "Текущие параметры усиления:",
             f"Ширина ленты: {self.current_width} мм",
             f"Длина усиления: {self.current_length}%",
+            f"Количество лент: {self.current_tape_count}",
             "",
             "Параметры материала:",
             f"Модуль упругости бетона: {self.slab_params['E_concrete']/1e9:.1f} ГПа",
             f"Модуль упругости углепластика: {self.slab_params['E_carbon']/1e9:.1f} ГПа",
             f"Толщина одного слоя: {self.LAYER_THICKNESS*1000:.1f} мм"
         ]
+        info += self._sensitivity_info()
+        if self.time_to_first_paint is not None:
+            info += ["", f"Время до первой отрисовки: {self.time_to_first_paint*1000:.0f} мс"]
         self.info_text.insert(tk.END, "\n".join(info))
 
     def export(self):
         try:
-            data = []
-            for item in self.tree.get_children():
-                values = self.tree.item(item)['values']
-                data.append({
-                    "Толщина (мм)": values[0],
-                    "Прогиб (мм)": values[1],
-                    "Снижение (%)": values[2],
-                    "Слоёв": values[3],
-                    "Площадь (м²)": values[4],
-                    "Эффективность (%/м²)": values[5]
-                })
-            
-            if not data:
+            r = self.results
+            if not len(r):
                 messagebox.showwarning("Предупреждение", "Нет данных для экспорта")
                 return
-                
-            df = pd.DataFrame(data)
+
+            import pandas as pd
+
+            # Столбцы результатов передаются в таблицу без разбора строк Treeview
+            df = pd.DataFrame({
+                "Толщина (мм)": r.thickness_mm,
+                "Прогиб (мм)": r.deflection,
+                "Снижение (%)": r.reduction,
+                "Слоёв": r.layers,
+                "Площадь (м²)": r.area,
+                "Эффективность (%/м²)": r.efficiency,
+            })
             filename = f"Результаты_{self.current_width}мм_{self.current_length}%.xlsx"
             df.to_excel(filename, index=False)
             messagebox.showinfo("Успех", f"Файл сохранен:\n{filename}")
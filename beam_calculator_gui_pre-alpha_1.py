@@ -3,6 +3,7 @@ import matplotlib.patches as patches
 import matplotlib.pyplot as plt
 from scipy.interpolate import make_interp_spline
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -478,6 +479,11 @@ class BeamCalculatorApp:
         self.canvas_widget = self.canvas_epure.get_tk_widget()
         self.canvas_widget.pack(side="left", fill="both", expand=True)
 
+        # Фон эпюры напряжений кэшируется после каждой полной перерисовки
+        self._stress_background = None
+        self._stress_params = None
+        self.canvas_epure.mpl_connect('draw_event', self._on_epure_draw)
+
         # Создаем оси для всех эпюр
         self.epure_m_plot = self.figure_epure.add_subplot(231)
         self.epure_q_plot = self.figure_epure.add_subplot(232)
@@ -541,66 +547,118 @@ class BeamCalculatorApp:
         self.section_pos_slider.set(mid)
         self._update_stress_plot(mid)
 
-    def _update_stress_plot(self, x_pos):
-        """Корректная эпюра нормальных напряжений"""
+    def _reset_stress_plot(self, width, thickness, tape_count):
+        """Построение статической части эпюры напряжений и анимируемых
+        элементов (линия, заливки, подпись) для обновления блиттингом"""
         try:
-            # Получаем параметры
-            width = int(self.width_combobox_tab3.get())
-            layers = int(self.layer_combobox_tab3.get())
-            tape_count = int(self.tape_count_combobox_tab3.get())
-            thickness = layers * self.LAYER_THICKNESS_MM / 1000
-            
-            # Расчет момента инерции
+            ax = self.epure_stress_plot
+            ax.clear()
+
+            # Параметры сечения для всех положений ползунка
             carbon_area = (width/1000) * thickness * tape_count
             I = self.calculate_inertia(carbon_area, thickness, tape_count)
-            
-            # Расчет момента в сечении
-            L = self.slab_params['span_length']
-            q = self.slab_params['q_load']
-            M = q * x_pos * (L - x_pos) / 2
-            
-            # Обновляем подпись положения
-            self.section_pos_label.config(text=f"{x_pos:.2f} м")
-            
-            # Очищаем график
-            self.epure_stress_plot.clear()
-            
-            # Координаты по высоте сечения
-            y = np.linspace(-thickness, self.slab_params['height'], 100)
-            
-            # Расчет напряжений
-            sigma = M * y / I  # Основная формула
-            
-            # Учет разных модулей упругости
             n = self.slab_params['E_carbon'] / self.slab_params['E_concrete']
-            sigma[y < 0] *= n  # Для углепластика
-            
-            # Переводим в МПа
-            sigma_mpa = sigma / 1e6
-            
-            # Рисуем эпюру (правильная ориентация)
-            self.epure_stress_plot.plot(sigma_mpa, y, 'm-', linewidth=2)
-            
-            # Заливка для растяжения/сжатия
-            self.epure_stress_plot.fill_betweenx(y, 0, sigma_mpa, 
-                                               where=(sigma_mpa>0), 
-                                               color='r', alpha=0.3, label='Растяжение (+)')
-            self.epure_stress_plot.fill_betweenx(y, 0, sigma_mpa,
-                                               where=(sigma_mpa<0),
-                                               color='b', alpha=0.3, label='Сжатие (-)')
-            
+            height = self.slab_params['height']
+            self._stress_params = (I, n, thickness, height)
+
+            # Анимируемые элементы не рисуются при полной перерисовке
+            self.stress_line, = ax.plot([], [], 'm-', linewidth=2, animated=True)
+            self.stress_fill_tension = PolyCollection(
+                [], color='r', alpha=0.3, label='Растяжение (+)', animated=True)
+            self.stress_fill_compression = PolyCollection(
+                [], color='b', alpha=0.3, label='Сжатие (-)', animated=True)
+            ax.add_collection(self.stress_fill_tension)
+            ax.add_collection(self.stress_fill_compression)
+            self.stress_pos_text = ax.text(
+                0.02, 0.97, "", transform=ax.transAxes, va='top', animated=True)
+
             # Нейтральная ось и оформление
-            self.epure_stress_plot.axvline(0, color='k', linestyle='-', linewidth=1)
-            self.epure_stress_plot.axhline(0, color='k', linestyle='--', linewidth=0.5)
-            
-            self.epure_stress_plot.set_title(f"Нормальные напряжения (x = {x_pos:.2f} м)")
-            self.epure_stress_plot.set_xlabel("σ, МПа")
-            self.epure_stress_plot.set_ylabel("Высота сечения, м")
-            self.epure_stress_plot.grid(True)
-            self.epure_stress_plot.legend()
-            
+            ax.axvline(0, color='k', linestyle='-', linewidth=1)
+            ax.axhline(0, color='k', linestyle='--', linewidth=0.5)
+
+            # Пределы осей по максимальному моменту (середина пролета), чтобы
+            # при движении ползунка не требовалась перерисовка осей
+            L = self.slab_params['span_length']
+            _, sigma_mid = self._stress_profile(L / 2)
+            sigma_max = max(abs(sigma_mid).max(), 1e-9)
+            ax.set_xlim(-1.1 * sigma_max, 1.1 * sigma_max)
+            ax.set_ylim(-thickness - 0.01, height + 0.01)
+
+            ax.set_title("Нормальные напряжения")
+            ax.set_xlabel("σ, МПа")
+            ax.set_ylabel("Высота сечения, м")
+            ax.grid(True)
+            ax.legend(loc='lower right')
+
+            self._set_stress_data(float(self.section_pos_slider.get()))
             self.canvas_epure.draw()
-            
+
+        except Exception as e:
+            print(f"Ошибка построения эпюры напряжений: {str(e)}")
+
+    def _stress_profile(self, x_pos):
+        """Напряжения (МПа) по высоте сечения в точке x_pos"""
+        I, n, thickness, height = self._stress_params
+
+        # Момент в сечении
+        L = self.slab_params['span_length']
+        q = self.slab_params['q_load']
+        M = q * x_pos * (L - x_pos) / 2
+
+        # Координаты по высоте сечения
+        y = np.linspace(-thickness, height, 100)
+
+        # Учет разных модулей упругости (углепластик ниже y = 0)
+        sigma = M * y / I
+        sigma[y < 0] *= n
+
+        return y, sigma / 1e6
+
+    def _set_stress_data(self, x_pos):
+        """Обновление данных анимируемых элементов эпюры напряжений"""
+        y, sigma_mpa = self._stress_profile(x_pos)
+        self.stress_line.set_data(sigma_mpa, y)
+
+        # Заливки растяжения/сжатия: многоугольники между эпюрой и осью σ = 0
+        for fill, part in ((self.stress_fill_tension, np.maximum(sigma_mpa, 0)),
+                           (self.stress_fill_compression, np.minimum(sigma_mpa, 0))):
+            verts = np.column_stack([np.concatenate([part, np.zeros_like(part)]),
+                                     np.concatenate([y, y[::-1]])])
+            fill.set_verts([verts])
+
+        self.stress_pos_text.set_text(f"x = {x_pos:.2f} м")
+
+    def _draw_stress_artists(self):
+        ax = self.epure_stress_plot
+        for artist in (self.stress_fill_tension, self.stress_fill_compression,
+                       self.stress_line, self.stress_pos_text):
+            ax.draw_artist(artist)
+
+    def _on_epure_draw(self, event=None):
+        """Кэширование фона эпюры напряжений после полной перерисовки"""
+        if self._stress_params is None:
+            return
+        self._stress_background = self.canvas_epure.copy_from_bbox(
+            self.epure_stress_plot.bbox)
+        self._draw_stress_artists()
+
+    def _update_stress_plot(self, x_pos):
+        """Обновление эпюры напряжений при движении ползунка (блиттинг)"""
+        try:
+            self.section_pos_label.config(text=f"{x_pos:.2f} м")
+            if self._stress_params is None:
+                return
+
+            self._set_stress_data(x_pos)
+
+            # Восстанавливаем фон осей и рисуем только изменившиеся элементы
+            if self._stress_background is None:
+                self.canvas_epure.draw()
+                return
+            self.canvas_epure.restore_region(self._stress_background)
+            self._draw_stress_artists()
+            self.canvas_epure.blit(self.epure_stress_plot.bbox)
+
         except Exception as e:
             print(f"Ошибка обновления эпюры напряжений: {str(e)}")
 
@@ -991,7 +1049,7 @@ class BeamCalculatorApp:
             self._update_shear_epure()
             self._update_deflection_epure(width, thickness*1000, tape_count)
             self._draw_section_plot(width/1000, thickness, tape_count)
-            self._update_stress_plot(float(self.section_pos_slider.get()))
+            self._reset_stress_plot(width, thickness, tape_count)
             
         except Exception as e:
             print(f"Ошибка обновления эпюр: {str(e)}")
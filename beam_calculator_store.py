@@ -0,0 +1,160 @@
+"""Постоянное хранилище результатов расчета (SQLite)
+
+Результаты сохраняются по ключу: хэш параметров плиты + (ширина, толщина,
+длина усиления, количество лент). Очистка старых записей:
+
+    python beam_calculator_store.py prune --days 90
+    python beam_calculator_store.py prune --keep 100000
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "beam_results.sqlite3")
+
+FIELDS = ('deflection', 'reduction', 'layers', 'area', 'efficiency')
+
+
+def slab_hash(slab):
+    """Устойчивый хэш параметров плиты (словарь или SlabParams)"""
+    params = slab if isinstance(slab, dict) else slab.as_dict()
+    text = json.dumps(params, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """Хранилище результатов расчета для повторного использования между сеансами"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS designs (
+                    slab_hash TEXT NOT NULL,
+                    width_mm REAL NOT NULL,
+                    thickness_mm REAL NOT NULL,
+                    length_percent REAL NOT NULL,
+                    tape_count INTEGER NOT NULL,
+                    deflection REAL,
+                    reduction REAL,
+                    layers INTEGER,
+                    area REAL,
+                    efficiency REAL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (slab_hash, width_mm, length_percent, tape_count, thickness_mm)
+                )""")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS designs_accessed ON designs (accessed)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def load(self, slab, width_mm, thicknesses_mm, length_percent, tape_count=1):
+        """Результаты для всех толщин или None, если хотя бы одной нет в хранилище"""
+        key = slab_hash(slab)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT thickness_mm, {', '.join(FIELDS)} FROM designs "
+                "WHERE slab_hash = ? AND width_mm = ? AND length_percent = ? AND tape_count = ?",
+                (key, float(width_mm), float(length_percent), int(tape_count))).fetchall()
+            found = {row[0]: row[1:] for row in rows}
+            if any(float(t) not in found for t in thicknesses_mm):
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE designs SET accessed = ? "
+                    "WHERE slab_hash = ? AND width_mm = ? AND length_percent = ? AND tape_count = ?",
+                    (time.time(), key, float(width_mm), float(length_percent), int(tape_count)))
+
+        values = np.array([found[float(t)] for t in thicknesses_mm], dtype=float)
+        results = {name: values[:, i] for i, name in enumerate(FIELDS)}
+        results['layers'] = results['layers'].astype(int)
+        return results
+
+    def save(self, slab, width_mm, thicknesses_mm, length_percent, results, tape_count=1):
+        """Сохранение результатов расчета для набора толщин"""
+        key = slab_hash(slab)
+        now = time.time()
+        rows = [
+            (key, float(width_mm), float(t), float(length_percent), int(tape_count),
+             *(float(results[name][i]) for name in FIELDS), now)
+            for i, t in enumerate(thicknesses_mm)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO designs (slab_hash, width_mm, thickness_mm, "
+                f"length_percent, tape_count, {', '.join(FIELDS)}, accessed) "
+                f"VALUES ({', '.join('?' * (6 + len(FIELDS)))})", rows)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+
+    def prune(self, max_age_days=None, keep=None):
+        """Удаление записей, не использовавшихся дольше max_age_days дней,
+        и/или всех, кроме keep последних использованных. Возвращает число
+        удаленных записей."""
+        deleted = 0
+        with self._lock, self._conn:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                deleted += self._conn.execute(
+                    "DELETE FROM designs WHERE accessed < ?", (cutoff,)).rowcount
+            if keep is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM designs WHERE rowid NOT IN "
+                    "(SELECT rowid FROM designs ORDER BY accessed DESC LIMIT ?)",
+                    (int(keep),)).rowcount
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return deleted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Обслуживание хранилища результатов")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="путь к файлу SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prune = commands.add_parser("prune", help="удалить старые записи")
+    prune.add_argument("--days", type=float, help="старше N дней с последнего использования")
+    prune.add_argument("--keep", type=int, help="оставить N последних использованных")
+
+    commands.add_parser("stats", help="число записей")
+
+    args = parser.parse_args(argv)
+    store = ResultStore(args.db)
+    try:
+        if args.command == "prune":
+            if args.days is None and args.keep is None:
+                parser.error("укажите --days и/или --keep")
+            print(f"Удалено записей: {store.prune(args.days, args.keep)}")
+        else:
+            print(f"Записей в хранилище: {store.count()}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Виртуальная таблица результатов для больших наборов вариантов
+
+Treeview содержит только видимые строки (несколько десятков элементов),
+которые переиспользуются при прокрутке: значения берутся из столбцов
+DesignResults по текущему порядку строк. Сортировка - np.argsort по столбцу,
+фильтр - векторная маска core.filter_mask, поэтому прокрутка, сортировка
+и фильтрация не зависят от числа строк в наборе.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+import beam_calculator_core as core
+
+
+class VirtualTable(ttk.Frame):
+    """Таблица DesignResults с прокруткой, сортировкой и фильтром
+
+    columns - [(имя столбца DesignResults, заголовок, формат), ...];
+    формат - строка вида "{:.2f}" или функция от значения.
+    """
+
+    def __init__(self, master, columns, height=15, column_width=100):
+        super().__init__(master)
+        self.height = height
+        self.column_width = column_width
+        self.results = core.DesignResults()
+        self._order = np.arange(0)
+        self._first = 0
+        self._sort_column = None
+        self._sort_descending = False
+
+        # Панель фильтра
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill="x", pady=2)
+        ttk.Label(filter_frame, text="Фильтр:").pack(side="left", padx=2)
+        self.filter_var = tk.StringVar()
+        entry = ttk.Entry(filter_frame, textvariable=self.filter_var)
+        entry.pack(side="left", fill="x", expand=True, padx=2)
+        entry.bind("<Return>", lambda event: self.apply_filter())
+        ttk.Button(filter_frame, text="Применить", command=self.apply_filter).pack(side="left", padx=2)
+        self.status = ttk.Label(filter_frame, text="")
+        self.status.pack(side="left", padx=5)
+
+        # Таблица видимых строк и полоса прокрутки по всему набору
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(body, show="headings", height=height, selectmode="browse")
+        self.tree.pack(fill="both", expand=True)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+
+        self.set_columns(columns)
+
+    def set_columns(self, columns):
+        """Смена набора отображаемых столбцов"""
+        self.columns = list(columns)
+        names = [name for name, _, _ in self.columns]
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = names
+        for name, heading, _ in self.columns:
+            self.tree.heading(name, text=heading, command=lambda n=name: self.sort_by(n))
+            self.tree.column(name, width=self.column_width, anchor="center")
+        # Постоянные элементы-строки, переиспользуемые при прокрутке
+        self._items = [self.tree.insert("", "end", values=()) for _ in range(self.height)]
+        self._formatters = [fmt.format if isinstance(fmt, str) else fmt
+                            for _, _, fmt in self.columns]
+        self._sort_column = None
+        self._refresh()
+
+    def set_results(self, results, columns=None):
+        """Новый набор результатов (фильтр сохраняется, сортировка сбрасывается)"""
+        self.results = results
+        self._order = np.arange(0)
+        if columns is not None:
+            self.set_columns(columns)
+        self._sort_column = None
+        self.apply_filter()
+
+    def apply_filter(self):
+        """Пересчет видимых строк по выражению фильтра"""
+        try:
+            mask = self.results.filter(self.filter_var.get())
+        except ValueError as e:
+            self.status.config(text=str(e))
+            return
+        order = np.flatnonzero(mask)
+        if self._sort_column is not None:
+            order = order[self._argsort(getattr(self.results, self._sort_column)[order])]
+        self._order = order
+        self._first = 0
+        self._refresh()
+
+    def sort_by(self, name):
+        """Сортировка по столбцу; повторный щелчок меняет направление"""
+        if self._sort_column == name:
+            self._sort_descending = not self._sort_descending
+        else:
+            self._sort_column, self._sort_descending = name, False
+        self._order = self._order[self._argsort(getattr(self.results, name)[self._order])]
+        self._first = 0
+        self._refresh()
+
+    def _argsort(self, values):
+        order = np.argsort(values, kind="stable")
+        return order[::-1] if self._sort_descending else order
+
+    def selected_index(self):
+        """Индекс выбранной строки в results или None"""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        row = self._first + self._items.index(selection[0])
+        return int(self._order[row]) if row < len(self._order) else None
+
+    def select_index(self, index):
+        """Прокрутка к строке results[index] и ее выделение
+        (ничего не делает, если строка скрыта фильтром)"""
+        rows = np.flatnonzero(self._order == index)
+        if not len(rows):
+            return
+        row = int(rows[0])
+        if not self._first <= row < self._first + self.height:
+            self._first = row
+        self._refresh()
+        self.tree.selection_set(self._items[row - self._first])
+
+    def scroll(self, rows):
+        self._first += rows
+        self._refresh()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._first = int(round(float(value) * len(self._order)))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self._first += int(value) * step
+        self._refresh()
+
+    def _refresh(self):
+        """Заполнение элементов Treeview видимыми строками"""
+        n = len(self._order)
+        self._first = max(0, min(self._first, n - self.height))
+        # Элементы переиспользуются, поэтому выделение строки не переносится
+        self.tree.selection_remove(self.tree.selection())
+        visible = self._order[self._first:self._first + self.height]
+
+        columns = [getattr(self.results, name)[visible].tolist() for name, _, _ in self.columns]
+        rows = zip(*columns) if columns else ()
+        for item, row in zip(self._items, rows):
+            self.tree.item(item, values=[fmt(value) for fmt, value in zip(self._formatters, row)])
+        for item in self._items[len(visible):]:
+            self.tree.item(item, values=())
+
+        if n:
+            self.scrollbar.set(self._first / n, (self._first + len(visible)) / n)
+        else:
+            self.scrollbar.set(0, 1)
+        self.status.config(text=f"Показано {n} из {len(self.results)}")
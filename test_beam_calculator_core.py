@@ -0,0 +1,168 @@
+"""Проверки расчетного ядра: модель результатов, фильтр, кэш, участки жесткости"""
+import numpy as np
+import pytest
+
+import beam_calculator_core as core
+
+SLAB = core.SlabParams()
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    return core.design_catalogue(SLAB, widths_mm=(100, 200), max_layers=3,
+                                 lengths_percent=(0, 50, 100), tape_counts=(1, 2))
+
+
+def test_integer_index(catalogue):
+    row = catalogue[3]
+    assert len(row) == 1
+    for name in core.DesignResults.__slots__:
+        assert getattr(row, name).tolist() == [getattr(catalogue, name)[3]]
+    assert catalogue[-1].deflection[0] == catalogue.deflection[-1]
+
+
+def test_slice_index(catalogue):
+    part = catalogue[2:7]
+    assert len(part) == 5
+    assert np.shares_memory(part.deflection, catalogue.deflection)
+    np.testing.assert_array_equal(part.area, catalogue.area[2:7])
+
+
+def test_mask_index(catalogue):
+    mask = catalogue.reduction > 10
+    part = catalogue[mask]
+    assert len(part) == mask.sum()
+    np.testing.assert_array_equal(part.width_mm, catalogue.width_mm[mask])
+    assert len(catalogue[np.zeros(len(catalogue), dtype=bool)]) == 0
+
+
+@pytest.mark.parametrize("length_percent", [0, 30, 99])
+def test_length_sensitivity_matches_forward_difference(length_percent):
+    step = 1e-4
+    exact = core.deflection_sensitivities(SLAB, 150, 2.4, length_percent)['length_percent']
+    f0, f1 = (core.deflection_sensitivities(SLAB, 150, 2.4, p)['deflection']
+              for p in (length_percent, length_percent + step))
+    assert exact < 0
+    assert exact == pytest.approx((f1 - f0) / step, rel=1e-3)
+
+
+def test_length_sensitivity_zero_at_full_span():
+    assert core.deflection_sensitivities(SLAB, 150, 2.4, 100)['length_percent'] == 0
+
+
+@pytest.mark.parametrize("expression", [
+    "reduction > 20 and 1 < 2",
+    "1 > 2 or reduction > 20",
+    "not 1 > 2 and reduction > 20",
+    "reduction > 20 and (area > 0 or 2 < 1)",
+    "0 < 20 < reduction",
+    "(reduction > 20) & (area > 0)",
+    "(reduction > 20) | (1 > 2)",
+])
+def test_filter_mixes_scalar_and_column_conditions(catalogue, expression):
+    np.testing.assert_array_equal(catalogue.filter(expression), catalogue.reduction > 20)
+
+
+def test_filter_bitwise_without_parentheses_is_value_error(catalogue):
+    with pytest.raises(ValueError, match="скобки"):
+        catalogue.filter("reduction > 20 & area < 1.5")
+
+
+def test_stress_field_follows_given_moment():
+    reinforcement = core.Reinforcement(150, 2.4, 45)
+    x, y, sigma = core.calculate_stress_field(SLAB, reinforcement, 101, 51)
+    M = core.calculate_moment(x, SLAB.span_length, SLAB.q_load)
+    np.testing.assert_array_equal(core.calculate_stress_field(
+        SLAB, reinforcement, 101, 51, moment=(x, M))[2], sigma)
+
+    # Два пролета: момент обратного знака, зона усиления в каждом пролете
+    x2 = np.concatenate([x, x[1:] + SLAB.span_length])
+    M2 = -np.concatenate([M, M[1:]])
+    x_field, _, sigma2 = core.calculate_stress_field(
+        SLAB, reinforcement, 201, 51, moment=(x2, M2))
+    assert x_field[-1] == pytest.approx(2 * SLAB.span_length)
+    np.testing.assert_allclose(sigma2[:, :101], -sigma, atol=1e-6 * np.nanmax(np.abs(sigma)))
+    np.testing.assert_array_equal(np.isnan(sigma2[:, 100:]), np.isnan(sigma))
+
+
+def test_load_table_semicolon_decimal_comma():
+    lines = ["x, м;q, Н/м\n", "0,5;1200,5\n", "4,7;3000\n", "\n", "9\t100,25\n"]
+    assert core.parse_load_table(lines) == ((0.5, 1200.5), (4.7, 3000.0), (9.0, 100.25))
+    assert core.parse_load_table(["0.5,1200.5", "4.7,3000"]) == ((0.5, 1200.5), (4.7, 3000.0))
+
+
+@pytest.mark.parametrize("bad_row", ["2;nan", "2;inf", "2;", "2"])
+def test_load_table_rejects_bad_rows(bad_row):
+    with pytest.raises(ValueError, match="строка 2"):
+        core.parse_load_table(["0;100", bad_row, "4;200"])
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = core.LRUCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    assert cache.get("a", lambda: None) == 1  # "a" становится последним
+    cache.get("c", lambda: 3)                 # вытесняется "b"
+    assert len(cache) == 2
+    assert cache.get("b", lambda: 20) == 20
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_design_cache_invalidated_by_slab_change():
+    cache = core.DesignCache()
+    reinforcement = core.Reinforcement(150, 2.4, 50)
+    first = cache.deflection(SLAB, reinforcement)
+    assert first == pytest.approx(core.calculate_deflection(SLAB, reinforcement))
+    assert cache.deflection(SLAB, reinforcement) == first
+    assert cache.stats()['deflection']['hits'] == 1
+
+    heavier = core.SlabParams(q_load=2 * SLAB.q_load)
+    assert cache.deflection(heavier, reinforcement) == pytest.approx(2 * first)
+    assert cache.stats()['deflection']['size'] == 1
+    assert cache.stats()['inertia']['size'] == 2
+
+
+@pytest.mark.parametrize("length_percent", [0, 50, 100])
+def test_staggered_equal_layers_match_single_zone(length_percent):
+    staggered = core.staggered_segments(SLAB, 150, [length_percent] * 3, tape_count=2)
+    single = core.reinforcement_segments(
+        SLAB, core.Reinforcement(150, 3 * core.LAYER_THICKNESS_MM, length_percent, 2))
+    assert len(staggered) == len(single)
+    for segment, expected in zip(staggered, single):
+        assert segment == pytest.approx(expected, rel=1e-12)
+
+
+def test_staggered_layers_overlap():
+    L = SLAB.span_length
+    segments = core.staggered_segments(SLAB, 150, [80, 40])
+    x0, x1, EI = zip(*segments)
+    assert x0 == pytest.approx([0, 0.1 * L, 0.3 * L, 0.7 * L, 0.9 * L])
+    assert x1[-1] == L
+    one, two = (core.reinforcement_segments(
+        SLAB, core.Reinforcement(150, n * core.LAYER_THICKNESS_MM, 100))[0][2] for n in (1, 2))
+    assert EI == pytest.approx([EI[0], one, two, one, EI[0]])
+    assert EI[0] < one < two
+
+
+def test_stiffness_zones_split_and_scale():
+    L, EI = SLAB.span_length, 1e8
+    segments = core.apply_stiffness_zones(
+        [(0.0, 4.0, EI), (4.0, L, 2 * EI)], [(3.0, 5.0, 0.5), (8.0, L, 0.1)])
+    assert segments == pytest.approx([
+        (0.0, 3.0, EI), (3.0, 4.0, 0.5 * EI), (4.0, 5.0, EI),
+        (5.0, 8.0, 2 * EI), (8.0, L, 0.2 * EI)])
+    lo, hi, stiffness = core.segment_arrays(L, segments)
+    np.testing.assert_array_equal(lo[1:], hi[:-1])
+
+
+@pytest.mark.parametrize("segments", [
+    [],
+    [(0.0, 4.0, 1e8), (5.0, 9.4, 1e8)],  # разрыв
+    [(0.0, 5.0, 1e8), (4.0, 9.4, 1e8)],  # наложение
+    [(0.0, 9.0, 1e8)],                   # не доходит до L
+    [(0.0, 5.0, 1e8), (5.0, 5.0, 1e8), (5.0, 9.4, 1e8)],  # нулевая длина
+    [(0.0, 5.0, 1e8), (5.0, 9.4, 0.0)],  # нулевая жесткость
+])
+def test_segment_arrays_rejects_bad_segments(segments):
+    with pytest.raises(ValueError):
+        core.segment_arrays(9.4, segments)
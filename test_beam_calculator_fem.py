@@ -0,0 +1,55 @@
+"""Сходимость МКЭ-расчета балки к точным решениям при сгущении сетки"""
+import numpy as np
+import pytest
+
+import beam_calculator_core as core
+import beam_calculator_fem as fem
+
+# scipy импортируется решателем при первом расчете
+pytest.importorskip("scipy")
+
+SLAB = core.SlabParams()
+L, Q = SLAB.span_length, SLAB.q_load
+EI = SLAB.E_concrete * float(core.calculate_inertia(SLAB))
+ELEMENTS = (1000, 5000, 10000, 20000)
+
+
+@pytest.mark.parametrize("n", ELEMENTS)
+def test_simply_supported(n):
+    solution = fem.solve_beam(SLAB, elements_per_span=n)
+    midspan = np.interp(L / 2, solution.x, solution.deflection)
+    assert midspan == pytest.approx(5 * Q * L**4 / (384 * EI) * 1000, rel=1e-7)
+    assert solution.reactions == pytest.approx([Q * L / 2] * 2, rel=1e-9)
+    assert solution.moment.max() == pytest.approx(Q * L**2 / 8, rel=1e-7)
+
+
+@pytest.mark.parametrize("n", ELEMENTS)
+def test_cantilever(n):
+    solution = fem.solve_beam(SLAB, supports=("fixed", "free"), elements_per_span=n)
+    assert solution.deflection[-1] == pytest.approx(Q * L**4 / (8 * EI) * 1000, rel=1e-7)
+    assert solution.reactions == pytest.approx([Q * L, 0], rel=1e-7)
+    assert solution.moment[0] == pytest.approx(-Q * L**2 / 2, rel=1e-7)
+
+
+@pytest.mark.parametrize("n", ELEMENTS)
+def test_fixed_fixed(n):
+    solution = fem.solve_beam(SLAB, supports=("fixed", "fixed"), elements_per_span=n)
+    midspan = np.interp(L / 2, solution.x, solution.deflection)
+    assert midspan == pytest.approx(Q * L**4 / (384 * EI) * 1000, rel=1e-7)
+    assert solution.moment[0] == pytest.approx(-Q * L**2 / 12, rel=1e-7)
+
+
+@pytest.mark.parametrize("n", ELEMENTS)
+def test_two_spans(n):
+    solution = fem.solve_beam(SLAB, supports=("pin", "pin", "pin"), spans=[L, L],
+                              elements_per_span=n)
+    assert solution.reactions == pytest.approx(Q * L * np.array([3, 10, 3]) / 8, rel=1e-7)
+
+
+@pytest.mark.parametrize("n", ELEMENTS)
+def test_reinforced_segments(n):
+    segments = core.reinforcement_segments(SLAB, core.Reinforcement(150, 4, 80))
+    solution = fem.solve_beam(SLAB, segments, elements_per_span=n)
+    midspan = np.interp(L / 2, solution.x, solution.deflection)
+    expected = core.piecewise_deflection(SLAB, segments, np.array([L / 2]))[0]
+    assert midspan == pytest.approx(expected, rel=1e-7)